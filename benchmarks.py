@@ -0,0 +1,165 @@
+import gc
+import os
+import json
+import tempfile
+import time
+import random
+import tracemalloc
+
+# Offline benchmarks behind `python bot.py bench <name>`; no network, no state files.
+
+SAMPLE_PRICES = ("4.99€", "9.99€", "14.99€", "19.99€", "29.99€", "39.99€", "59.99€")
+SAMPLE_SUFFIX = "?snr=1_7_7_2300_150_1"
+
+
+# 📢 Generate a synthetic history in the JSON state format
+def make_history_records(count, seed=42):
+    rng = random.Random(seed)
+    records = {}
+    for i in range(count):
+        appid = 10 + i * 10
+        name = f"Game {appid}"
+        original = rng.choice(SAMPLE_PRICES)
+        discount = rng.choice((0, 10, 20, 25, 33, 50, 60, 75, 80, 90))
+        cents = int(original[:-1].replace(".", ""))
+        current = cents * (100 - discount) // 100
+        records[name] = {
+            "name": name,
+            "discount": f"-{discount}%" if discount else "0%",
+            "original_price": original,
+            "current_price": f"{current // 100}.{current % 100:02d}€",
+            "link": f"https://store.steampowered.com/app/{appid}/Game_{appid}/{SAMPLE_SUFFIX}",
+            "date": "2025-02-11 21:24:02",
+        }
+    return records
+
+
+# 📢 Load a JSON file as plain dicts (the format used before Deal records)
+def _load_json(path):
+    with open(path, "r", encoding="utf-8") as file:
+        return json.load(file)
+
+
+# 📢 Measure the memory held by the object built by `build`
+def _measure(build):
+    gc.collect()
+    tracemalloc.start()
+    obj = build()
+    gc.collect()
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return obj, size
+
+
+# 📢 Compare the memory of a history held as dicts vs Deal records
+def bench_memory(records=50000):
+    from storage import load_deals
+
+    payload = json.dumps(make_history_records(records))
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "history.json")
+        with open(path, "w", encoding="utf-8") as file:
+            file.write(payload)
+        dicts, dict_bytes = _measure(lambda: _load_json(path))
+        deals, deal_bytes = _measure(lambda: load_deals(path, "History"))
+    assert len(dicts) == len(deals) == records
+
+    print(f"🧠 History of {records} records:")
+    print(f"   dict records: {dict_bytes / 1024 / 1024:7.1f} MiB ({dict_bytes / records:.0f} B/record)")
+    print(f"   Deal records: {deal_bytes / 1024 / 1024:7.1f} MiB ({deal_bytes / records:.0f} B/record)")
+    print(f"   saved: {(1 - deal_bytes / dict_bytes) * 100:.0f}%")
+
+
+# 📢 Build Deal records with random review, tag and platform data
+def make_deals(count, seed=42):
+    from deals import Deal
+
+    rng = random.Random(seed)
+    tag_pool = [19, 122, 492, 597, 1662, 1664, 1685, 1695, 3859, 4182]
+    deals = {}
+    for title, data in make_history_records(count, seed).items():
+        deals[title] = Deal.from_dict(dict(
+            data,
+            review_percent=rng.randint(30, 99),
+            review_bucket=rng.randint(0, 6),
+            tags=rng.sample(tag_pool, 4),
+            platforms=rng.choice((1, 3, 5, 7)),
+        ))
+    return deals
+
+
+# 📢 Time the compiled filter predicate over `records` deals
+def bench_filter(records=100000):
+    from filters import compile_filter, apply_filter
+
+    deals = make_deals(records)
+    rules = {
+        "min_discount": 50, "max_price": 20, "min_review_percent": 70,
+        "exclude_tags": [1664], "platforms": ["linux"], "deny_appids": [100, 200],
+    }
+
+    start = time.perf_counter()
+    predicate = compile_filter(rules)
+    compile_ms = (time.perf_counter() - start) * 1000
+
+    timings = []
+    for _ in range(5):
+        start = time.perf_counter()
+        matched = apply_filter(predicate, deals)
+        timings.append(time.perf_counter() - start)
+    best = min(timings)
+
+    print(f"🔎 Filter over {records} deals: {rules}")
+    print(f"   compile: {compile_ms:.2f} ms")
+    print(f"   evaluate: {best * 1000:.1f} ms ({best / records * 1e9:.0f} ns/record, "
+          f"{best / records * 100000 * 1000:.1f} ms per 100k), {len(matched)} matched")
+
+
+# 📢 Compare per-deal predicates with NumPy columns for many filters over `records` deals
+def bench_columnar(records=100000, chats=20):
+    import columnar
+    from filters import compile_filter, apply_filter
+
+    if columnar.np is None:
+        print("⚠️ NumPy is not installed: the columnar path is disabled.")
+        return
+
+    deals = make_deals(records)
+    rng = random.Random(7)
+    rules_list = [
+        {"min_discount": rng.choice((25, 50, 75)), "max_price": rng.choice((5, 10, 20)),
+         "min_review_percent": rng.choice((0, 70, 80)), "platforms": [rng.choice(("win", "mac", "linux"))]}
+        for _ in range(chats)
+    ]
+
+    start = time.perf_counter()
+    expected = [apply_filter(compile_filter(rules), deals) for rules in rules_list]
+    predicate_s = time.perf_counter() - start
+
+    start = time.perf_counter()
+    columns = columnar.DealColumns(deals)
+    build_s = time.perf_counter() - start
+    start = time.perf_counter()
+    matched = [columns.select(columnar.filter_mask(columns, rules)) for rules in rules_list]
+    columnar_s = time.perf_counter() - start
+    assert [list(result) for result in matched] == [list(result) for result in expected]
+
+    print(f"📊 {chats} filters over {records} deals:")
+    print(f"   predicates: {predicate_s * 1000:7.1f} ms")
+    print(f"   columns:    {columnar_s * 1000:7.1f} ms (+ {build_s * 1000:.1f} ms to build the columns once)")
+
+
+BENCHMARKS = {
+    "memory": bench_memory,
+    "filter": bench_filter,
+    "columnar": bench_columnar,
+}
+
+
+# 📢 Run a benchmark by name (default record count when `records` is None)
+def run_benchmark(name, records=None):
+    if records is None:
+        BENCHMARKS[name]()
+    else:
+        BENCHMARKS[name](records)
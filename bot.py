@@ -1,202 +1,474 @@
 import os
-import requests
-import asyncio
-import logging
-import json
-import re
-import time
-from datetime import datetime
-from telegram import Bot
-from telegram.constants import ParseMode
-from telegram.request import HTTPXRequest
-from bs4 import BeautifulSoup
-from dotenv import load_dotenv
-
-# 📢 Load environment variables
-load_dotenv()
-
-# 📢 TELEGRAM CONFIGURATION
-TELEGRAM_BOT_TOKEN = os.getenv("TELEGRAM_BOT_TOKEN")
-TELEGRAM_CHAT_ID = os.getenv("TELEGRAM_CHAT_ID")
-
-# 📢 FILTER CONFIGURATION
-HISTORY_FILE = "historical_promotions.json"
-BEST_DEALS_FILE = "best_deals.json"
-EXECUTION_ID_FILE = "execution_id.txt"
-DISCOUNT_FILTER = 45  # Apenas jogos com desconto ≥ 45%
-MESSAGE_INTERVAL = 6  # Intervalo seguro entre mensagens (segundos)
-
-# 📢 STEAM PROMOTION URL
-STEAM_PROMO_URL = "https://store.steampowered.com/search/results/?query&specials=1"
-
-# 📢 BOT CONFIGURATION
-request = HTTPXRequest()
-bot = Bot(token=TELEGRAM_BOT_TOKEN, request=request)
-
-# 📢 LOGGING CONFIGURATION
-LOG_FILE = "steam_promo_bot.log"
-
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler(LOG_FILE, encoding="utf-8"),
-        logging.StreamHandler()
-    ]
-)
-
-# 📢 BOT VERSION
-BOT_VERSION = "2.2"
-
-# 📢 Notify Telegram about version update
-async def send_version_notification():
-    message = f"🚀 Steam Promo Bot - Version {BOT_VERSION} is now running!"
-    await send_telegram_message(message)
-
-# 📢 Get Execution ID
-def get_execution_id():
-    if os.path.exists(EXECUTION_ID_FILE):
-        try:
-            with open(EXECUTION_ID_FILE, "r") as f:
-                return int(f.read().strip())  
-        except ValueError:
-            return 1  
-    return 1  
-
-# 📢 Update Execution ID
-def save_execution_id(exec_id):
-    with open(EXECUTION_ID_FILE, "w") as f:
-        f.write(str(exec_id))
-
-# 📢 Load history
-def load_history():
-    try:
-        with open(HISTORY_FILE, "r", encoding="utf-8") as file:
-            return json.load(file)
-    except (FileNotFoundError, json.JSONDecodeError):
-        logging.warning("⚠️ History file not found or corrupted. Creating a new one.")
-        return {}
-
-# 📢 Load previously sent best deals
-def load_best_deals():
-    try:
-        with open(BEST_DEALS_FILE, "r", encoding="utf-8") as file:
-            return json.load(file)
-    except (FileNotFoundError, json.JSONDecodeError):
-        logging.warning("⚠️ Best deals file not found or corrupted. Creating a new one.")
-        return {}
-
-# 📢 Extract promotions from Steam
-def extract_promotions():
-    history = load_history()
-
-    response = requests.get(STEAM_PROMO_URL, headers={"User-Agent": "Mozilla/5.0"})
-    if response.status_code != 200:
-        logging.error(f"Error accessing Steam: {response.status_code}")
-        return {}
-
-    soup = BeautifulSoup(response.text, 'html.parser')
-    games = {}
+import sys
 
-    for item in soup.select('.search_result_row'):
-        try:
-            title = item.select_one('.title').text.strip()
-            discount_element = item.select_one('.discount_pct')
-            original_price_element = item.select_one('.discount_original_price')
-            current_price_element = item.select_one('.discount_final_price')
-
-            discount_text = discount_element.text.strip() if discount_element else "0%"
-            original_price = original_price_element.text.strip() if original_price_element else "N/A"
-            current_price = current_price_element.text.strip() if current_price_element else "N/A"
-
-            games[title] = {
-                "name": title,
-                "discount": discount_text,
-                "original_price": original_price,
-                "current_price": current_price,
-                "link": item["href"],
-            }
-        except Exception as e:
-            logging.warning(f"Error processing item: {e}")
+ENV_FILE = ".env"
 
-    history.update(games)
+# Dependencies (telegram, bs4, requests, dotenv, even logging and config) are imported
+# inside the stages that need them, so importing this module does no work.
 
-    with open(HISTORY_FILE, "w", encoding="utf-8") as file:
-        json.dump(history, file, indent=4, ensure_ascii=False)
+# 📢 Load environment variables (python-dotenv is only imported when a .env file exists).
+# Must run before config is imported, since config reads the environment.
+def load_env():
+    if not os.path.exists(ENV_FILE):
+        return
+    from dotenv import load_dotenv
+    load_dotenv(ENV_FILE)
+
+# 📢 Find new or significantly better best deals of a region and add them to its outbox
+# Deals that got worse are recorded without a message; games sent within CHANGE_COOLDOWN are queued
+# and wait there until it ends (see send_pending_deals).
+# Subscribed chats are matched against `changed` (the records changed by the last scrape), or the whole history.
+def queue_new_deals(region="", changed=None):
+    import logging
+    from deals import select_best_deals, find_price_changes, merge_deals
+    from storage import load_history, load_best_deals, save_best_deals, load_outbox, save_outbox
+    from subscriptions import queue_subscription_deals
+
+    history = load_history(region)
+    best_deals = select_best_deals(history)
+    previous_best_deals = load_best_deals(region)
+    new_deals, worse_deals = find_price_changes(best_deals, previous_best_deals)
+    queue_subscription_deals(history if changed is None else changed, region)
+
+    outbox = merge_deals(load_outbox(region), new_deals)
+    if worse_deals:
+        previous_best_deals.update(worse_deals)
+        save_best_deals(previous_best_deals, region)
+        for title in worse_deals:
+            outbox.pop(title, None)  # Queued at a price that is gone
+    save_outbox(outbox, region)
+
+    label = region.upper() or "default"
+    logging.info(
+        f"📥 {len(new_deals)} new promotions queued ({len(outbox)} waiting to be sent, {label}); "
+        f"{len(worse_deals)} price increases recorded."
+    )
+    return new_deals
+
+# 📢 Send the deals waiting in a region's outbox to its chat, and those of its subscribed chats,
+# best first (see delivery.py). With `limit`, at most `limit` deals are sent and the rest stay queued.
+# Games sent within CHANGE_COOLDOWN stay queued, and are sent on the first run after it ends.
+async def send_pending_deals(region="", limit=None):
+    import logging
+    from deals import ready_deals
+    from delivery import deliver_deals
+    from quiet_hours import region_schedule
+    import time
+    from storage import (
+        load_best_deals, save_best_deals, load_outbox, save_outbox, load_lows, load_notified, save_notified,
+    )
+    from subscriptions import send_subscription_deals
+    from telegram_sender import get_region_chat_id
 
-    logging.info(f"✅ Promotions saved successfully ({len(games)} new promotions).")
-    return games
+    lows = load_lows(region)
+    subscription_count = await send_subscription_deals(region, lows, limit)
+
+    outbox = load_outbox(region)
+    if not outbox:
+        logging.info("❌ No new promotions found. No messages will be sent.")
+        return subscription_count
 
-# 📢 Send messages to Telegram
-async def send_telegram_message(message):
-    max_attempts = 3
-    for attempt in range(1, max_attempts + 1):
+    previous_best_deals = load_best_deals(region)
+    notified = load_notified(region)
+    now = int(time.time())
+    ready = ready_deals(
+        outbox, lambda title, deal: notified.get(str(deal.appid or title)) if title in previous_best_deals else None, now
+    )
+    if len(ready) < len(outbox):
+        logging.info(f"🧊 {len(outbox) - len(ready)} promotions wait for the end of their cooldown.")
+    if not ready:
+        return subscription_count
+
+    delivered = await deliver_deals(ready, get_region_chat_id(region), region, lows, limit, region_schedule(region))
+    for title in delivered:
+        deal = previous_best_deals[title] = outbox.pop(title)
+        notified[str(deal.appid or title)] = now
+
+    save_best_deals(previous_best_deals, region)
+    save_notified(notified, region)
+    save_outbox(outbox, region)
+    return len(delivered) + subscription_count
+
+# 📢 Fetch app details of the deals that changed (new or stale appids only)
+async def enrich_changed_deals(games_by_region):
+    from config import ENRICHMENT_ENABLED
+    from log_config import log_stage
+
+    deals = [deal for games in games_by_region.values() for deal in games.values()]
+    if not ENRICHMENT_ENABLED or not deals:
+        return 0
+    with log_stage("enrich"):
+        from enrichment import enrich_deals
+        return await enrich_deals(deals)
+
+# 📢 Answer the bot commands received since the last run (errors don't stop the run)
+async def answer_commands():
+    import logging
+    from log_config import log_stage
+
+    with log_stage("commands"):
+        from commands import process_pending_updates
         try:
-            await bot.send_message(
-                chat_id=TELEGRAM_CHAT_ID,
-                text=message,
-                parse_mode=ParseMode.HTML
-            )
-            logging.info(f"✅ Message successfully sent on attempt {attempt}!")
-            return True
+            return await process_pending_updates()
         except Exception as e:
-            logging.error(f"❌ Error sending message (attempt {attempt}): {e}")
-            await asyncio.sleep(5)
-
-    logging.error(f"❌ Failed to send message after {max_attempts} attempts.")
-    return False
-
-# 📢 Format game message
-def format_game_message(deal):
-    return (
-        f"🎮 {deal['name']}\n"
-        f"💰 Original Price: {deal['original_price']}\n"
-        f"🔥 Current Price: {deal['current_price']}\n"
-        f"🛍️ Discount: {deal['discount']}\n"
-        f"🔗 <a href='{deal['link']}'>View on Steam</a>"
-    )
-
-# 📢 Process Best Deals and send only new promotions
-async def process_best_deals():
-    execution_id = get_execution_id() + 1
-    history = load_history()
-    previous_best_deals = load_best_deals()
-
-    best_deals = {
-        title: data for title, data in history.items()
-        if "N/A" not in data["original_price"]
-        and int(''.join(filter(str.isdigit, data["discount"]))) >= DISCOUNT_FILTER
-    }
-
-    new_deals = {}
-    for title, deal in best_deals.items():
-        if title not in previous_best_deals:
-            new_deals[title] = deal
-        elif (previous_best_deals[title]["discount"] != deal["discount"] or
-              previous_best_deals[title]["current_price"] != deal["current_price"]):
-            new_deals[title] = deal
-
-    if not new_deals:
-        logging.info("❌ No new promotions found. No messages will be sent.")
+            logging.error(f"❌ Error reading bot commands: {e}", extra={"error": type(e).__name__})
+            return 0
+
+# 📢 Alert the users watching the changed games (watches follow the first configured region)
+async def alert_watchers(games_by_region):
+    from config import get_regions
+    from log_config import log_stage
+
+    region = get_regions()[0]
+    with log_stage("watch"):
+        from watches import notify_watchers
+        return await notify_watchers(games_by_region.get(region, {}), region)
+
+# 📢 Regions selected on the command line, or every configured region
+def selected_regions(args):
+    from config import get_regions
+
+    region = getattr(args, "region", None)
+    return [region.lower()] if region else get_regions()
+
+# 📢 One crawl: scrape, watch alerts, enrichment, diff and send
+async def crawl_and_send():
+    from log_config import log_stage
+    from deal_index import update_index
+
+    with log_stage("scrape"):
+        from config import FREE_FAST_PATH
+        from giveaways import send_free_deals
+        from scraper import extract_promotions
+        games_by_region = await extract_promotions(on_free=send_free_deals if FREE_FAST_PATH else None)
+    update_index(games_by_region)
+    await alert_watchers(games_by_region)
+    await enrich_changed_deals(games_by_region)
+    with log_stage("diff"):
+        for region, games in games_by_region.items():
+            if games:
+                queue_new_deals(region, games)
+    with log_stage("send"):
+        for region in games_by_region:
+            await send_pending_deals(region)
+    await refresh_leaderboards(games_by_region)
+
+# 📢 Rebuild the leaderboard message of every chat (one edit per changed chat, none when unchanged)
+async def refresh_leaderboards(regions):
+    from config import LEADERBOARD
+    from log_config import log_stage
+
+    if LEADERBOARD == "off":
         return
+    with log_stage("leaderboard"):
+        from leaderboard import update_region_leaderboards
+        for region in regions:
+            await update_region_leaderboards(region)
 
-    for title, deal in new_deals.items():
-        message = format_game_message(deal)
-        sent = await send_telegram_message(message)
-        if sent:
-            previous_best_deals[title] = deal
-        await asyncio.sleep(MESSAGE_INTERVAL)
-
-    with open(BEST_DEALS_FILE, "w", encoding="utf-8") as file:
-        json.dump(previous_best_deals, file, indent=4, ensure_ascii=False)
+# 📢 Count a run that sends: its execution ID (the one main() set for the logs) is saved once per run
+def start_run():
+    from log_config import set_execution_id
+    from storage import get_execution_id, save_execution_id
 
+    execution_id = get_execution_id() + 1
+    set_execution_id(execution_id)
     save_execution_id(execution_id)
 
 # 📢 Main function
 async def check_and_send_promotions():
-    await send_version_notification()
-    extract_promotions()
-    await process_best_deals()
+    from delivery import start_deadline
+    from log_config import log_stage
+    from telegram_sender import send_version_notification
+
+    start_run()
+    start_deadline()
+    with log_stage("notify"):
+        await send_version_notification()
+    await answer_commands()
+    await crawl_and_send()
+
+# 📢 Daemon: answer commands continuously and crawl every SERVE_INTERVAL seconds
+# Commands arrive by long polling, or through the webhook server when WEBHOOK_URL is set (or `webhook`).
+async def serve(webhook=False):
+    import asyncio
+    import logging
+    from config import SERVE_INTERVAL, POLL_TIMEOUT, WEBHOOK_URL
+    from deal_index import get_index
+    from delivery import start_deadline
+    from log_config import log_stage
+    from telegram_sender import send_version_notification
+
+    with log_stage("notify"):
+        await send_version_notification()
+    logging.info(f"🗂️ Deal index ready ({len(get_index())} promotions).")
+
+    async def poll():
+        from commands import process_pending_updates
+        from telegram_sender import get_bot
+
+        await get_bot().delete_webhook()
+        while True:
+            try:
+                await process_pending_updates(timeout=POLL_TIMEOUT)
+            except Exception as e:
+                logging.error(f"❌ Error reading bot commands: {e}", extra={"error": type(e).__name__})
+                await asyncio.sleep(5)
+
+    async def crawl():
+        while True:
+            start_run()
+            start_deadline()
+            try:
+                await crawl_and_send()
+            except Exception as e:
+                logging.error(f"❌ Crawl failed: {e}", extra={"error": type(e).__name__}, exc_info=True)
+            await asyncio.sleep(SERVE_INTERVAL)
+
+    if WEBHOOK_URL:
+        from webhook import run_webhook
+        receive = run_webhook()
+    elif webhook:
+        # Local server only (e.g. for `post-updates`), not registered with Telegram
+        from webhook import WebhookServer
+        receive = WebhookServer().serve_forever()
+    else:
+        receive = poll()
+    await asyncio.gather(receive, crawl())
+
+# 📢 Subcommand: full run (version notice, commands, scrape, watch alerts, diff, send)
+def cmd_run(args):
+    from log_config import LOG_FILE
+    from profiling import run_with_profiling
+
+    run_with_profiling(check_and_send_promotions, LOG_FILE)
+
+# 📢 Subcommand: scrape Steam and update the history
+def cmd_scrape(args):
+    import asyncio
+    from log_config import log_stage
+
+    with log_stage("scrape"):
+        from scraper import extract_promotions
+        games_by_region = asyncio.run(extract_promotions(
+            save_html=args.save_html, force=args.force, regions=selected_regions(args),
+        ))
+    for region, games in games_by_region.items():
+        print(f"🔍 {len(games)} new or changed promotions scraped ({region.upper() or 'default'}).")
+
+# 📢 Subcommand: fetch app details for the history (new or stale appids only)
+def cmd_enrich(args):
+    import asyncio
+    from log_config import log_stage
+    from storage import load_history
+
+    deals = [deal for region in selected_regions(args) for deal in load_history(region).values()]
+    with log_stage("enrich"):
+        from enrichment import enrich_deals
+        fetched = asyncio.run(enrich_deals(deals))
+    print(f"🧩 App details fetched for {fetched} apps.")
+
+# 📢 Subcommand: queue new or changed best deals
+def cmd_diff(args):
+    from log_config import log_stage
+
+    with log_stage("diff"):
+        for region in selected_regions(args):
+            new_deals = queue_new_deals(region)
+            print(f"📥 {len(new_deals)} new promotions queued ({region.upper() or 'default'}).")
+
+# 📢 Subcommand: send queued deals
+def cmd_send(args):
+    from log_config import LOG_FILE, log_stage
+    from profiling import run_with_profiling
+
+    async def send():
+        from delivery import start_deadline
+
+        start_run()
+        start_deadline()
+        with log_stage("send"):
+            return [await send_pending_deals(region, limit=args.limit) for region in selected_regions(args)]
+
+    sent = run_with_profiling(send, LOG_FILE)
+    print(f"📤 {sum(sent)} promotions sent.")
+
+# 📢 Subcommand: run as a daemon (commands answered as they arrive, crawl every SERVE_INTERVAL)
+def cmd_serve(args):
+    import asyncio
+
+    asyncio.run(serve(webhook=args.webhook))
+
+# 📢 Subcommand: post recorded updates to a webhook server (test harness)
+def cmd_post_updates(args):
+    import asyncio
+    from config import WEBHOOK_LISTEN, WEBHOOK_PORT, WEBHOOK_PATH
+    from webhook import post_updates
+
+    url = args.url or f"http://{WEBHOOK_LISTEN}:{WEBHOOK_PORT}{WEBHOOK_PATH}"
+    result = asyncio.run(post_updates(args.payloads, url, concurrency=args.concurrency, repeat=args.repeat))
+    print(f"🪝 {result['posted']} updates posted to {url} in {result['seconds']:.2f} s "
+          f"(p50 {result['p50_ms']:.1f} ms, max {result['max_ms']:.1f} ms): {result['statuses']}")
+
+# 📢 Subcommand: answer the bot commands received since the last run
+def cmd_updates(args):
+    import asyncio
+
+    handled = asyncio.run(answer_commands())
+    print(f"💬 {handled} commands answered.")
+
+# 📢 Subcommand: parse a saved page offline and show what would be sent
+def cmd_replay(args):
+    import time
+    from deals import select_best_deals, find_new_deals, format_game_message
+    from ranking import top_deals
+    from scraper import PAGE_STRATEGIES, check_page
+    from storage import load_history, load_best_deals, load_lows, load_scrape_health
+
+    with open(args.html_file, "r", encoding="utf-8") as file:
+        html = file.read()
+
+    region = args.region.lower() if args.region else ""
+    health = load_scrape_health(region)
+    games = {}
+    for name, parse in PAGE_STRATEGIES.items():
+        start = time.perf_counter()
+        for _ in range(args.repeat):
+            parsed = parse(html)
+        parse_ms = (time.perf_counter() - start) * 1000 / args.repeat
+        problem = check_page(parsed, health)
+        print(f"🔁 {name}: {len(parsed)} promotions parsed in {parse_ms:.1f} ms (average of {args.repeat}), "
+              f"{problem or 'valid'}.")
+        if not games and problem is None:
+            games = parsed
+
+    history = load_history(region)
+    history.update(games)
+    new_deals = find_new_deals(select_best_deals(history), load_best_deals(region))
+
+    print(f"📥 {len(new_deals)} promotions would be sent.")
+    if args.show:
+        titles, _ = top_deals(new_deals, lows=load_lows(region))
+        for title in titles:
+            print(f"\n{format_game_message(new_deals[title], region)}")
+
+# 📢 Subcommand: run an offline benchmark
+def cmd_bench(args):
+    from benchmarks import run_benchmark
+
+    run_benchmark(args.name, args.records)
+
+# 📢 Subcommand: show state file statistics
+def cmd_stats(args):
+    import json
+    from config import (
+        HISTORY_FILE, BEST_DEALS_FILE, OUTBOX_FILE, EXECUTION_ID_FILE, SUBSCRIPTIONS_FILE, get_regions, region_path,
+    )
+    from storage import load_scrape_health
+
+    def count(path):
+        try:
+            with open(path, "r", encoding="utf-8") as file:
+                return len(json.load(file))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return 0
+
+    try:
+        with open(EXECUTION_ID_FILE, "r") as file:
+            execution_id = file.read().strip()
+    except FileNotFoundError:
+        execution_id = "1"
+
+    print(f"🆔 Execution ID: {execution_id}")
+    for region in get_regions():
+        if region:
+            print(f"🌍 Region {region.upper()}:")
+        print(f"📜 Promotions in history: {count(region_path(HISTORY_FILE, region))}")
+        print(f"🏆 Best deals sent: {count(region_path(BEST_DEALS_FILE, region))}")
+        print(f"📥 Promotions waiting to be sent: {count(region_path(OUTBOX_FILE, region))}")
+        health = load_scrape_health(region)
+        if health:
+            timings = ", ".join(f"{name} {ms} ms" for name, ms in health.get("timings", {}).items())
+            print(f"🧩 Parser: {health.get('state', 'ok')} ({timings})")
+    print(f"👥 Subscribed chats: {count(SUBSCRIPTIONS_FILE)}")
+
+# 📢 Subcommand: clear history, best deals and the outbox
+def cmd_clear(args):
+    from clear_history import clear_history
+
+    clear_history()
+
+# 📢 Build the command-line parser
+def build_parser():
+    import argparse
+
+    parser = argparse.ArgumentParser(prog="bot.py", description="Steam Promo Bot")
+    subparsers = parser.add_subparsers(dest="command")
+
+    subparsers.add_parser("run", help="version notice, commands, scrape, diff and send (default)").set_defaults(func=cmd_run)
+
+    scrape = subparsers.add_parser("scrape", help="scrape Steam and update the history")
+    scrape.add_argument("--save-html", metavar="FILE", help="also save the raw page for `replay`")
+    scrape.add_argument("--force", action="store_true", help="parse every page even if its fingerprint is unchanged")
+    scrape.add_argument("--region", help="only this country code (default: every STEAM_REGIONS entry)")
+    scrape.set_defaults(func=cmd_scrape)
+
+    enrich = subparsers.add_parser("enrich", help="fetch app details for the history (new or stale appids only)")
+    enrich.add_argument("--region", help="only this country code (default: every STEAM_REGIONS entry)")
+    enrich.set_defaults(func=cmd_enrich)
+
+    diff = subparsers.add_parser("diff", help="queue new or changed best deals")
+    diff.add_argument("--region", help="only this country code (default: every STEAM_REGIONS entry)")
+    diff.set_defaults(func=cmd_diff)
+
+    send = subparsers.add_parser("send", help="send queued deals")
+    send.add_argument("--limit", type=int, default=None, help="send at most N deals per region")
+    send.add_argument("--region", help="only this country code (default: every STEAM_REGIONS entry)")
+    send.set_defaults(func=cmd_send)
+
+    serve_parser = subparsers.add_parser("serve", help="run as a daemon: answer commands and crawl every SERVE_INTERVAL")
+    serve_parser.add_argument("--webhook", action="store_true", help="receive updates with the webhook server even without WEBHOOK_URL")
+    serve_parser.set_defaults(func=cmd_serve)
+
+    post_updates = subparsers.add_parser("post-updates", help="post recorded updates to a webhook server (test harness)")
+    post_updates.add_argument("payloads", help="JSON file with a list of Telegram updates")
+    post_updates.add_argument("--url", help="webhook URL (default: the local server)")
+    post_updates.add_argument("--concurrency", type=int, default=10, help="requests in flight")
+    post_updates.add_argument("--repeat", type=int, default=1, help="post the list N times")
+    post_updates.set_defaults(func=cmd_post_updates)
+    subparsers.add_parser("updates", help="answer the bot commands received since the last run").set_defaults(func=cmd_updates)
+
+    replay = subparsers.add_parser("replay", help="parse a saved page offline, without sending")
+    replay.add_argument("html_file")
+    replay.add_argument("--region", help="compare against this region's state")
+    replay.add_argument("--repeat", type=int, default=1, help="parse N times and report the average time")
+    replay.add_argument("--show", action="store_true", help="print the messages that would be sent")
+    replay.set_defaults(func=cmd_replay)
+
+    bench = subparsers.add_parser("bench", help="run an offline benchmark")
+    bench.add_argument("name", choices=["memory", "filter", "columnar"])
+    bench.add_argument("--records", type=int, default=None, help="number of synthetic records")
+    bench.set_defaults(func=cmd_bench)
+
+    subparsers.add_parser("stats", help="show state file statistics").set_defaults(func=cmd_stats)
+    subparsers.add_parser("clear", help="clear history, best deals and the outbox").set_defaults(func=cmd_clear)
+
+    return parser
+
+# 📢 Entry point
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    func = getattr(args, "func", cmd_run)
+
+    load_env()
+
+    # `stats` and `bench` don't need logging
+    if func not in (cmd_stats, cmd_bench):
+        from log_config import LOG_FILE, setup_logging, set_execution_id
+        from storage import get_execution_id
+
+        setup_logging(LOG_FILE)
+        set_execution_id(get_execution_id() + 1)
+    func(args)
 
 if __name__ == "__main__":
-    asyncio.run(check_and_send_promotions())
\ No newline at end of file
+    main(sys.argv[1:])
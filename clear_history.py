@@ -1,27 +1,33 @@
 import json
 import os
+import glob
 import logging
+from log_config import setup_logging
 
-# 📢 File names
-HISTORY_FILE = "history_promotions.json"
-BEST_DEALS_FILE = "best_deals.json"
-EXECUTION_ID_FILE = "execution_id.txt"
-
-# 📢 Logging configuration
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(message)s",
-    handlers=[
-        logging.FileHandler("steam_promo_bot.log", encoding="utf-8"),
-        logging.StreamHandler()
-    ]
+# 📢 File names (shared with bot.py)
+from config import (
+    HISTORY_FILE, BEST_DEALS_FILE, OUTBOX_FILE, FINGERPRINTS_FILE, APP_METADATA_FILE, LOWS_FILE, EXECUTION_ID_FILE,
+    NOTIFIED_FILE,
+    SUBSCRIPTION_OUTBOX_FILE, SUBSCRIPTION_SENT_FILE, DEFERRED_CHATS_FILE,
 )
 
+# 📢 State files to clear, including the per-region ones (best_deals_us.json, ...)
+def state_files():
+    files = []
+    for file in [HISTORY_FILE, BEST_DEALS_FILE, OUTBOX_FILE, FINGERPRINTS_FILE, LOWS_FILE, NOTIFIED_FILE]:
+        base, extension = os.path.splitext(file)
+        files.append(file)
+        files.extend(sorted(glob.glob(f"{base}_??{extension}")))
+    for file in [APP_METADATA_FILE, SUBSCRIPTION_OUTBOX_FILE, SUBSCRIPTION_SENT_FILE, DEFERRED_CHATS_FILE]:
+        if os.path.exists(file):
+            files.append(file)
+    return files
+
 def clear_history():
     """ Removes all stored promotions and recreates empty JSON files. """
     cleared_files = []
 
-    for file in [HISTORY_FILE, BEST_DEALS_FILE]:
+    for file in state_files():
         if os.path.exists(file):
             try:
                 with open(file, "w", encoding="utf-8") as f:
@@ -29,7 +35,7 @@ def clear_history():
                 logging.info(f"🗑️ Cleared {file} successfully.")
                 cleared_files.append(file)
             except Exception as e:
-                logging.error(f"❌ Error clearing {file}: {e}")
+                logging.error(f"❌ Error clearing {file}: {e}", extra={"error": type(e).__name__})
                 print(f"❌ Error clearing {file}: {e}")
         else:
             logging.warning(f"⚠️ {file} not found. Creating an empty file.")
@@ -42,7 +48,7 @@ def clear_history():
             f.write("1")
         logging.info("🔄 Execution ID reset to 1.")
     except Exception as e:
-        logging.error(f"❌ Error resetting execution ID: {e}")
+        logging.error(f"❌ Error resetting execution ID: {e}", extra={"error": type(e).__name__})
         print(f"❌ Error resetting execution ID: {e}")
 
     if cleared_files:
@@ -51,4 +57,5 @@ def clear_history():
         print("✅ No existing history found. Empty files created.")
 
 if __name__ == "__main__":
+    setup_logging()
     clear_history()
@@ -0,0 +1,152 @@
+from config import COLUMNAR_MIN_RECORDS, CHANGE_MIN_DISCOUNT, CHANGE_MIN_DROP
+from deals import PLATFORM_BITS
+from filters import normalize_rules, compile_filter, apply_filter
+
+# Columnar view of a catalog for bulk work (many filters, ranking, diffs) over thousands of deals.
+# NumPy is optional: without it (or for small catalogs) callers keep the per-deal code paths.
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+# 📢 Stand-in for a missing price or appid in an integer column
+MISSING = -1
+
+
+# 📢 Whether the columnar path is worth it for `count` deals
+def use_columns(count):
+    return np is not None and count >= COLUMNAR_MIN_RECORDS
+
+
+# 📢 NumPy arrays of the numeric Deal fields, one row per deal (same order as `titles`)
+class DealColumns:
+    __slots__ = (
+        "titles", "deals", "appid", "discount", "original_cents", "current_cents",
+        "review_percent", "review_bucket", "platforms",
+    )
+
+    def __init__(self, deals):
+        self.titles = list(deals)
+        self.deals = list(deals.values())
+        count = len(self.deals)
+
+        def column(values, dtype="int64"):
+            return np.fromiter(values, dtype=dtype, count=count)
+
+        self.appid = column(MISSING if deal.appid is None else deal.appid for deal in self.deals)
+        self.discount = column((deal.discount for deal in self.deals), "int16")
+        self.original_cents = column(MISSING if deal.original_cents is None else deal.original_cents for deal in self.deals)
+        self.current_cents = column(MISSING if deal.current_cents is None else deal.current_cents for deal in self.deals)
+        self.review_percent = column((deal.review_percent or 0 for deal in self.deals), "int16")
+        self.review_bucket = column((deal.review_bucket for deal in self.deals), "int8")
+        self.platforms = column((deal.platforms for deal in self.deals), "int8")
+
+    def __len__(self):
+        return len(self.titles)
+
+    # 📢 Current price with a missing price counted as 0 (as in compile_filter)
+    @property
+    def price_cents(self):
+        return np.maximum(self.current_cents, 0)
+
+    # 📢 Absolute savings in cents (0 when a price is missing)
+    @property
+    def savings_cents(self):
+        return np.where(self.original_cents >= 0, self.original_cents - self.price_cents, 0)
+
+    # 📢 Deals of the rows selected by a boolean mask or an index array
+    def select(self, rows):
+        if rows.dtype == bool:
+            rows = np.flatnonzero(rows)
+        return {self.titles[i]: self.deals[i] for i in rows}
+
+
+# 📢 Boolean mask of the rows matching filter rules (same semantics as filters.compile_filter)
+def filter_mask(columns, rules):
+    rules = normalize_rules(rules)
+    mask = columns.original_cents >= 0
+
+    if "min_discount" in rules:
+        mask &= columns.discount >= rules["min_discount"]
+    if "min_price" in rules:
+        mask &= columns.price_cents >= round(rules["min_price"] * 100)
+    if "max_price" in rules:
+        mask &= columns.price_cents <= round(rules["max_price"] * 100)
+    if "min_review_percent" in rules:
+        mask &= columns.review_percent >= rules["min_review_percent"]
+    if "min_review_bucket" in rules:
+        mask &= columns.review_bucket >= rules["min_review_bucket"]
+    if "platforms" in rules:
+        platform_mask = sum(PLATFORM_BITS.get(platform, 0) for platform in rules["platforms"])
+        mask &= (columns.platforms & platform_mask) != 0
+    if "deny_appids" in rules:
+        mask &= ~np.isin(columns.appid, rules["deny_appids"])
+
+    # Tags are variable-length: checked per deal, only on the rows still selected
+    if "include_tags" in rules or "exclude_tags" in rules:
+        include_tags = frozenset(rules.get("include_tags", ()))
+        exclude_tags = frozenset(rules.get("exclude_tags", ()))
+        for i in np.flatnonzero(mask):
+            tag_ids = columns.deals[i].tag_ids
+            if (include_tags and include_tags.isdisjoint(tag_ids)) or not exclude_tags.isdisjoint(tag_ids):
+                mask[i] = False
+
+    if "allow_appids" in rules:
+        mask |= np.isin(columns.appid, rules["allow_appids"])
+    return mask
+
+
+# 📢 Filter deals with several rule sets at once (one result dict per rule set)
+def filter_deals_many(deals, rules_list):
+    if not use_columns(len(deals)):
+        if len(rules_list) == 1:
+            return [apply_filter(compile_filter(rules_list[0]), deals)]
+        # One pass over the deals, every predicate evaluated on each
+        checks = [(compile_filter(rules), {}) for rules in rules_list]
+        for title, deal in deals.items():
+            for predicate, matched in checks:
+                if predicate(deal):
+                    matched[title] = deal
+        return [matched for _, matched in checks]
+    columns = DealColumns(deals)
+    return [columns.select(filter_mask(columns, rules)) for rules in rules_list]
+
+
+# 📢 Filter deals with one rule set
+def filter_deals(deals, rules):
+    return filter_deals_many(deals, [rules])[0]
+
+
+# 📢 Indices of the `k` largest values, largest first (ties keep row order)
+def top_indices(values, k):
+    if k <= 0:
+        return np.empty(0, dtype="int64")
+    if k >= len(values):
+        return np.argsort(-values, kind="stable")
+    candidates = np.argpartition(-values, k - 1)[:k]
+    return candidates[np.lexsort((candidates, -values[candidates]))]
+
+
+# 📢 (New or significantly better deals, deals that got worse) (columnar deals.find_price_changes)
+def find_changed_deals(best_deals, previous_best_deals):
+    if not previous_best_deals:
+        return dict(best_deals), {}
+    columns = DealColumns(best_deals)
+    previous = DealColumns(previous_best_deals)
+    previous_rows = {title: i for i, title in enumerate(previous.titles)}
+    rows = np.fromiter((previous_rows.get(title, MISSING) for title in columns.titles), dtype="int64", count=len(columns))
+
+    known = rows >= 0
+    aligned = np.where(known, rows, 0)
+    discount = columns.discount.astype("int64")
+    previous_discount = previous.discount[aligned].astype("int64")
+    price = columns.current_cents
+    previous_price = previous.current_cents[aligned]
+    priced = (price != MISSING) & (previous_price != MISSING)
+    dropped = priced & (price < previous_price)
+    raised = priced & (price > previous_price)
+
+    better = ~known | (discount - previous_discount >= max(CHANGE_MIN_DISCOUNT, 1)) | (
+        dropped & ((previous_price - price) * 100 >= CHANGE_MIN_DROP * previous_price))
+    worse = known & ~better & (raised | (~dropped & (discount < previous_discount)))
+    return columns.select(better), columns.select(worse)
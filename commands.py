@@ -0,0 +1,213 @@
+import html
+import asyncio
+import logging
+
+from storage import get_update_offset, save_update_offset
+from telegram_sender import get_bot, send_telegram_message, edit_telegram_message
+
+# Bot commands. Updates are read with getUpdates at the start of each run (Telegram keeps them
+# for 24 hours), or continuously by `bot.py serve`. Handlers return the reply text, or
+# (text, reply_markup) for paginated lists.
+
+PAGE_SIZE = 10
+MAX_QUERY_BYTES = 40  # callback_data is limited to 64 bytes
+INLINE_RESULTS = 20
+ALLOWED_UPDATES = ["message", "callback_query", "inline_query"]
+
+
+# 📢 Titles of a list command: name -> (header, [title, ...]) from the deal index
+def list_titles(name, arg):
+    from deal_index import get_index
+
+    index = get_index()
+    if name == "deals":
+        return f"🔥 Deals with at least {arg}% off", index.top_discounts(int(arg))
+    if name == "search":
+        return f"🔎 Deals matching “{html.escape(arg)}”", index.search(arg)
+    return "📉 Deals at their historic low", index.historic_lows()
+
+
+# 📢 One page of a list command, with ◀️ / ▶️ buttons (callback data "name:arg:page")
+def render_page(name, arg, page):
+    from telegram import InlineKeyboardButton, InlineKeyboardMarkup
+    from deal_index import get_index
+    from deals import format_deal_line
+
+    header, titles = list_titles(name, arg)
+    if not titles:
+        return f"{header}: none right now."
+    pages = (len(titles) + PAGE_SIZE - 1) // PAGE_SIZE
+    page = min(max(page, 1), pages)
+    deals = get_index().deals
+    lines = [f"{header} ({len(titles)}, page {page}/{pages}):"]
+    lines.extend(format_deal_line(deals[title]) for title in titles[(page - 1) * PAGE_SIZE:page * PAGE_SIZE])
+
+    buttons = []
+    if page > 1:
+        buttons.append(InlineKeyboardButton("◀️", callback_data=f"{name}:{arg}:{page - 1}"))
+    if page < pages:
+        buttons.append(InlineKeyboardButton("▶️", callback_data=f"{name}:{arg}:{page + 1}"))
+    return "\n".join(lines), InlineKeyboardMarkup([buttons]) if buttons else None
+
+
+# 📢 /deals [min%]
+async def cmd_deals(chat_id, args):
+    from config import DISCOUNT_FILTER
+
+    try:
+        min_discount = int(args[0].rstrip("%")) if args else DISCOUNT_FILTER
+    except ValueError:
+        return "Usage: /deals [minimum discount %]"
+    return render_page("deals", str(min_discount), 1)
+
+
+# 📢 /search <title>
+async def cmd_search(chat_id, args):
+    query = " ".join(args).encode("utf-8")[:MAX_QUERY_BYTES].decode("utf-8", "ignore").replace(":", " ").strip()
+    if not query:
+        return "Usage: /search &lt;title&gt;"
+    return render_page("search", query, 1)
+
+
+# 📢 /low
+async def cmd_low(chat_id, args):
+    return render_page("low", "", 1)
+
+
+# 📢 /watch <appid|url> [max price]
+async def cmd_watch(chat_id, args):
+    from watches import parse_appid, add_watch
+
+    usage = "Usage: /watch &lt;appid or store link&gt; [max price, e.g. 4.99]"
+    appid = parse_appid(args[0]) if args else None
+    if appid is None:
+        return usage
+    try:
+        max_cents = add_watch(chat_id, appid, args[1] if len(args) > 1 else None)
+    except ValueError as e:
+        return f"❌ {html.escape(str(e))}\n{usage}"
+    condition = f"drops to {max_cents / 100:.2f} or less" if max_cents is not None else "is on sale"
+    return f"👀 Watching app {appid}. You'll get a message when it {condition}."
+
+
+# 📢 /unwatch <appid|url>
+async def cmd_unwatch(chat_id, args):
+    from watches import parse_appid, remove_watch
+
+    appid = parse_appid(args[0]) if args else None
+    if appid is None:
+        return "Usage: /unwatch &lt;appid or store link&gt;"
+    if remove_watch(chat_id, appid):
+        return f"🗑️ App {appid} removed from your watch list."
+    return f"App {appid} is not on your watch list."
+
+
+# 📢 /watches
+async def cmd_watches(chat_id, args):
+    from watches import chat_watches
+
+    watches = chat_watches(chat_id)
+    if not watches:
+        return "Your watch list is empty. Add a game with /watch &lt;appid or store link&gt; [max price]."
+    lines = [f"👀 {len(watches)} watched games:"]
+    for appid, max_cents in sorted(watches.items()):
+        cap = f" (≤ {max_cents / 100:.2f})" if max_cents is not None else ""
+        lines.append(f"• <a href='https://store.steampowered.com/app/{appid}/'>{appid}</a>{cap}")
+    return "\n".join(lines)
+
+
+COMMANDS = {
+    "deals": cmd_deals,
+    "search": cmd_search,
+    "low": cmd_low,
+    "watch": cmd_watch,
+    "unwatch": cmd_unwatch,
+    "watches": cmd_watches,
+}
+
+
+# 📢 Show another page of a list (a ◀️ / ▶️ button was pressed)
+async def handle_callback(query):
+    name, _, rest = (query.data or "").partition(":")
+    arg, _, page = rest.rpartition(":")
+    if name not in ("deals", "search", "low") or not page.isdigit():
+        await query.answer()
+        return False
+    reply = render_page(name, arg, int(page))
+    text, markup = reply if isinstance(reply, tuple) else (reply, None)
+    await edit_telegram_message(query.message.chat_id, query.message.message_id, text, markup)
+    await query.answer()
+    return True
+
+
+# 📢 Answer an inline query (@bot <title>) with matching deals, or the top discounts when empty
+async def handle_inline_query(query):
+    from telegram import InlineQueryResultArticle, InputTextMessageContent
+    from telegram.constants import ParseMode
+    from config import SEARCH_CACHE_TTL
+    from deal_index import get_index
+    from deals import format_game_message
+    from enrichment import get_app_details
+
+    index = get_index()
+    text = query.query.strip()
+    titles = index.search(text, INLINE_RESULTS) if text else index.top_discounts()[:INLINE_RESULTS]
+
+    results = []
+    for position, title in enumerate(titles):
+        deal = index.deals.get(title)
+        if deal is None:
+            continue  # Sale ended since the results were cached: never post it as a current deal
+        details = get_app_details(deal.appid) if deal.appid else None
+        results.append(InlineQueryResultArticle(
+            id=str(position),
+            title=deal.name,
+            description=f"{deal.discount_text} → {deal.current_price} (was {deal.original_price})",
+            input_message_content=InputTextMessageContent(format_game_message(deal, index.region), parse_mode=ParseMode.HTML),
+            thumbnail_url=(details or {}).get("header_image"),
+        ))
+    await query.answer(results, cache_time=SEARCH_CACHE_TTL)
+    return True
+
+
+# 📢 Answer one update (a command, a button press or an inline query); anything else is ignored
+async def handle_update(update):
+    if update.callback_query is not None:
+        return await handle_callback(update.callback_query)
+    if update.inline_query is not None:
+        return await handle_inline_query(update.inline_query)
+    message = update.message
+    if message is None or not message.text or not message.text.startswith("/"):
+        return False
+    name, *args = message.text.split()
+    handler = COMMANDS.get(name[1:].split("@")[0].lower())
+    if handler is None:
+        return False
+    try:
+        reply = await handler(message.chat_id, args)
+    except Exception as e:
+        logging.error(f"❌ Error handling {name}: {e}", extra={"error": type(e).__name__})
+        reply = "❌ Something went wrong. Please try again later."
+    if reply:
+        text, markup = reply if isinstance(reply, tuple) else (reply, None)
+        await send_telegram_message(text, chat_id=message.chat_id, reply_markup=markup)
+    return True
+
+
+# 📢 Answer the commands received since the last call (waits up to `timeout` seconds for new ones)
+# The updates of a batch are handled concurrently.
+async def process_pending_updates(timeout=0):
+    updates = await get_bot().get_updates(
+        offset=get_update_offset(), timeout=timeout, allowed_updates=ALLOWED_UPDATES,
+        read_timeout=timeout + 10,
+    )
+    if not updates:
+        return 0
+    results = await asyncio.gather(*(handle_update(update) for update in updates), return_exceptions=True)
+    save_update_offset(updates[-1].update_id + 1)
+    for result in results:
+        if isinstance(result, Exception):
+            logging.error(f"❌ Error handling an update: {result}", extra={"error": type(result).__name__})
+    handled = sum(result is True for result in results)
+    logging.info(f"💬 {handled} commands answered ({len(updates)} updates).")
+    return handled
@@ -0,0 +1,111 @@
+import os
+
+# 📢 FILES
+HISTORY_FILE = "historical_promotions.json"
+BEST_DEALS_FILE = "best_deals.json"
+EXECUTION_ID_FILE = "execution_id.txt"
+OUTBOX_FILE = "pending_deals.json"  # Deals found by `diff` and waiting for `send`
+FINGERPRINTS_FILE = "fingerprints.json"  # Page and record hashes from the last scrape
+APP_METADATA_FILE = "app_metadata.json"  # Per-app data shared by every region (store link)
+APP_DETAILS_FILE = "app_details.json"  # Cached appdetails (genres, release date, Metacritic, header image)
+LOWS_FILE = "historic_lows.json"  # Lowest price seen per game (historic-low bonus of the ranking)
+SUBSCRIPTIONS_FILE = "subscriptions.json"  # Extra chats with their own region and filter rules
+SUBSCRIPTION_OUTBOX_FILE = "subscription_outbox.json"  # Deals waiting to be sent, per subscribed chat
+SUBSCRIPTION_SENT_FILE = "subscription_sent.json"  # Discount and price last sent, per subscribed chat
+WATCHES_FILE = "watches.json"  # Price watches of users: {appid: {chat_id: watch}}
+UPDATE_OFFSET_FILE = "update_offset.txt"  # Next Telegram update to read (bot commands)
+LEADERBOARD_FILE = "leaderboards.json"  # Pinned leaderboard message of each chat
+MEDIA_CACHE_FILE = "media_cache.json"  # Telegram file_id of each game's header image
+DEFERRED_CHATS_FILE = "deferred_chats.json"  # Chats whose deals were held back by quiet hours
+NOTIFIED_FILE = "notified.json"  # When each game was last sent to the region chat (CHANGE_COOLDOWN)
+SCRAPE_HEALTH_FILE = "scrape_health.json"  # Row counts, strategy timings and state of the parser (per region)
+
+# 📢 FILTER CONFIGURATION
+DISCOUNT_FILTER = int(os.getenv("DESCONTO_MINIMO", "45"))  # Apenas jogos com desconto ≥ 45%
+FILTERS_FILE = "filters.json"  # Optional extra filter rules (see filters.py)
+COLUMNAR_MIN_RECORDS = int(os.getenv("COLUMNAR_MIN_RECORDS", "5000"))  # Catalogs this big use NumPy columns (if installed)
+MESSAGE_INTERVAL = 6  # Intervalo seguro entre mensagens (segundos)
+TELEGRAM_TIMEOUT = 5  # Seconds for each connect, write and read of a Telegram request
+SEND_ATTEMPTS = 3  # Attempts per message, SEND_RETRY_DELAY seconds apart
+SEND_RETRY_DELAY = 5
+FREE_FAST_PATH = os.getenv("FREE_FAST_PATH", "true").strip().lower() == "true"  # Send -100% deals as soon as they are parsed
+FREE_LATENCY_TARGET = int(os.getenv("FREE_LATENCY_TARGET", "30"))  # Seconds from page fetch to delivered message
+CHANGE_MIN_DISCOUNT = int(os.getenv("CHANGE_MIN_DISCOUNT", "5"))  # A sent deal is sent again if its discount grows this many points
+CHANGE_MIN_DROP = float(os.getenv("CHANGE_MIN_DROP", "5"))  # ... or its price drops this many % (increases are recorded silently)
+CHANGE_COOLDOWN = float(os.getenv("CHANGE_COOLDOWN", "24"))  # Hours before the same game is sent again (0: no cooldown)
+QUIET_HOURS = os.getenv("QUIET_HOURS", "")  # e.g. 23-8: deals found then wait for one digest at 8:00
+QUIET_TIMEZONE = os.getenv("QUIET_TIMEZONE", "UTC")
+RUN_DEADLINE = int(os.getenv("RUN_DEADLINE", "0"))  # Seconds a run may take (0: no limit); see delivery.py
+SEND_MARGIN = 10  # Seconds kept free before the deadline for the digest and saving the state
+
+# 📢 RANKING (see ranking.py)
+RANK_TOP_K = int(os.getenv("RANK_TOP_K", "20"))  # Deals sent one by one per run and region (0: all)
+RANK_DIGEST = os.getenv("RANK_DIGEST", "true").strip().lower() == "true"  # The rest go out in one digest message
+RANK_WEIGHTS = {"discount": 1.0, "savings": 0.2, "review": 5.0, "low": 25.0}
+RANK_WEIGHTS.update(  # e.g. RANK_WEIGHTS=savings=0.5,low=40
+    (key.strip(), float(value)) for key, value in
+    (item.split("=", 1) for item in os.getenv("RANK_WEIGHTS", "").split(",") if "=" in item)
+)
+
+# 📢 LEADERBOARD: off, also (leaderboard and one message per deal) or only (leaderboard, no deal messages)
+LEADERBOARD = os.getenv("LEADERBOARD", "off").strip().lower()
+LEADERBOARD_SIZE = int(os.getenv("LEADERBOARD_SIZE", "20"))
+
+# 📢 PHOTO POSTS (header image + message as caption)
+DEAL_PHOTOS = os.getenv("DEAL_PHOTOS", "false").strip().lower() == "true"
+PHOTO_GROUP_SIZE = min(max(int(os.getenv("PHOTO_GROUP_SIZE", "10")), 1), 10)  # Photos per album (1: no albums)
+
+# 📢 STEAM PROMOTION URL
+STEAM_PROMO_URL = "https://store.steampowered.com/search/results/?query&specials=1"
+SCRAPE_PAGES = int(os.getenv("SCRAPE_PAGES", "1"))  # Search result pages fetched per run
+SCRAPE_PAGE_SIZE = 50  # Rows per search results page (start/count of the JSON endpoint)
+SCRAPE_MIN_ROWS_RATIO = float(os.getenv("SCRAPE_MIN_ROWS_RATIO", "0.5"))  # A page must have this share of the usual rows
+SCRAPE_MIN_COMPLETENESS = float(os.getenv("SCRAPE_MIN_COMPLETENESS", "0.9"))  # ... and this share of complete records
+
+# 📢 REGIONS (e.g. STEAM_REGIONS=pt,us,br). Empty: the region of the runner's IP, legacy state files
+STEAM_REGIONS = [cc.strip().lower() for cc in os.getenv("STEAM_REGIONS", "").split(",") if cc.strip()]
+STEAM_LANGUAGE = os.getenv("STEAM_LANGUAGE", "english")  # Same titles in every region
+SCRAPE_CONCURRENCY = int(os.getenv("SCRAPE_CONCURRENCY", "2"))  # Requests in flight, shared by all regions
+SCRAPE_INTERVAL = float(os.getenv("SCRAPE_INTERVAL", "1.0"))  # Seconds between request starts, shared
+
+# 📢 APP DETAILS ENRICHMENT
+APP_DETAILS_URL = "https://store.steampowered.com/api/appdetails"
+ENRICHMENT_ENABLED = os.getenv("ENRICH_APPS", "true").strip().lower() == "true"
+ENRICHMENT_TTL = int(os.getenv("ENRICHMENT_TTL_DAYS", "7")) * 86400  # Details are refreshed after this
+ENRICHMENT_ERROR_TTL = 6 * 3600  # Failed lookups are retried after 6 hours
+ENRICHMENT_BATCH_SIZE = 20  # Appids per batch
+ENRICHMENT_CONCURRENCY = int(os.getenv("ENRICHMENT_CONCURRENCY", "4"))
+ENRICHMENT_MAX_PER_RUN = int(os.getenv("ENRICHMENT_MAX_PER_RUN", "100"))
+
+# 📢 HTTP CACHE
+HTTP_CACHE_DIR = ".http_cache"
+HTTP_CACHE_TTL = int(os.getenv("HTTP_CACHE_TTL", "300"))  # Seconds a response is reused without revalidation
+
+# 📢 DAEMON (`bot.py serve`)
+SERVE_INTERVAL = int(os.getenv("SERVE_INTERVAL", "3600"))  # Seconds between two crawls
+POLL_TIMEOUT = 30  # Long polling timeout of getUpdates (seconds)
+SEARCH_CACHE_TTL = int(os.getenv("SEARCH_CACHE_TTL", "30"))  # Seconds a /search or inline query result is reused
+
+# 📢 WEBHOOK (optional, instead of long polling; see webhook.py)
+WEBHOOK_URL = os.getenv("WEBHOOK_URL", "")  # Public HTTPS URL of the reverse proxy (registered with Telegram)
+WEBHOOK_LISTEN = os.getenv("WEBHOOK_LISTEN", "127.0.0.1")
+WEBHOOK_PORT = int(os.getenv("WEBHOOK_PORT", "8080"))
+WEBHOOK_PATH = os.getenv("WEBHOOK_PATH", "/telegram")
+WEBHOOK_SECRET = os.getenv("WEBHOOK_SECRET", "")  # Checked against X-Telegram-Bot-Api-Secret-Token
+WEBHOOK_CONCURRENCY = int(os.getenv("WEBHOOK_CONCURRENCY", "40"))  # Updates handled at the same time
+
+# 📢 BOT VERSION
+BOT_VERSION = "2.2"
+
+
+# 📢 Regions to crawl ("" is the default region)
+def get_regions():
+    return STEAM_REGIONS or [""]
+
+
+# 📢 State file of a region: best_deals.json -> best_deals_us.json
+def region_path(path, region):
+    if not region:
+        return path
+    base, extension = os.path.splitext(path)
+    return f"{base}_{region}{extension}"
@@ -0,0 +1,197 @@
+import re
+import time
+import heapq
+import unicodedata
+from collections import OrderedDict
+
+from sortedcontainers import SortedList
+
+from config import SEARCH_CACHE_TTL
+from ranking import is_historic_low
+
+# In-memory index of the deals of one region, answering bot queries without touching Steam or the disk:
+#   - deals sorted by discount (then price) for /deals
+#   - trigrams of the normalized titles for /search and inline queries (results cached per query)
+#   - the set of deals at their historic low for /low
+# It holds the deals on sale now (on the specials pages at the last crawl): the crawler updates it with the
+# changed records after every scrape and removes the sales that ended.
+
+NON_ALNUM_PATTERN = re.compile(r"[^0-9a-z]+")
+TRADEMARK_SYMBOLS = str.maketrans("", "", "™®©℠")
+SEARCH_CACHE_SIZE = 1024
+
+# 📢 Index shared by the command handlers (built on first use)
+_index = None
+
+
+# 📢 Normalize a title for search: no ™/®, accents or punctuation, lowercase, words separated by one space
+# ("Pokémon™: Let's Go!" -> "pokemon let s go")
+def normalize_title(title):
+    text = unicodedata.normalize("NFKD", title.translate(TRADEMARK_SYMBOLS))
+    text = "".join(char for char in text if not unicodedata.combining(char))
+    return NON_ALNUM_PATTERN.sub(" ", text.lower()).strip()
+
+
+# 📢 Trigrams of a normalized title, spaces left out ("half-life" and "halflife" share them)
+def trigrams(text):
+    text = text.replace(" ", "")
+    return {text[i:i + 3] for i in range(len(text) - 2)}
+
+
+# 📢 How well a title matches a query: 0 same title, 1 title prefix, 2 word prefix, 3 anywhere
+def match_rank(query, title):
+    if title == query:
+        return 0
+    if title.startswith(query):
+        return 1
+    if f" {title}".find(f" {query}") != -1:
+        return 2
+    return 3
+
+
+# 📢 Search results cached per normalized query for a few seconds (bursts of identical queries)
+class QueryCache:
+    def __init__(self, ttl=SEARCH_CACHE_TTL, size=SEARCH_CACHE_SIZE):
+        self.ttl = ttl
+        self.size = size
+        self.entries = OrderedDict()  # query -> (expires_at, results)
+
+    def get(self, query):
+        entry = self.entries.get(query)
+        if entry is None or entry[0] < time.monotonic():
+            return None
+        self.entries.move_to_end(query)
+        return entry[1]
+
+    def put(self, query, results):
+        self.entries[query] = (time.monotonic() + self.ttl, results)
+        self.entries.move_to_end(query)
+        if len(self.entries) > self.size:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        self.entries.clear()
+
+
+# 📢 In-memory deal index of a region
+class DealIndex:
+    def __init__(self, deals=None, lows=None, region=""):
+        self.region = region
+        self.deals = {}
+        self.titles = {}  # title -> normalized title
+        self.by_discount = SortedList()  # (-discount, current_cents, title)
+        self.grams = {}  # trigram -> {title}
+        self.lows = set()
+        self.search_cache = QueryCache()
+        self.update(deals or {}, lows or {})
+
+    def __len__(self):
+        return len(self.deals)
+
+    @staticmethod
+    def _sort_key(title, deal):
+        return (-deal.discount, deal.current_cents if deal.current_cents is not None else -1, title)
+
+    # 📢 Add new deals and replace changed ones
+    def update(self, deals, lows=None):
+        if deals:
+            self.search_cache.clear()
+        for title, deal in deals.items():
+            previous = self.deals.get(title)
+            if previous is not None:
+                self.by_discount.discard(self._sort_key(title, previous))
+            else:
+                normalized = self.titles[title] = normalize_title(title)
+                for gram in trigrams(normalized):
+                    self.grams.setdefault(gram, set()).add(title)
+            self.deals[title] = deal
+            self.by_discount.add(self._sort_key(title, deal))
+            if lows is None:
+                continue
+            if is_historic_low(title, deal, lows):
+                self.lows.add(title)
+            else:
+                self.lows.discard(title)
+
+    # 📢 Remove deals (sales that ended)
+    def remove(self, titles):
+        for title in titles:
+            deal = self.deals.pop(title, None)
+            if deal is None:
+                continue
+            self.search_cache.clear()
+            self.by_discount.discard(self._sort_key(title, deal))
+            for gram in trigrams(self.titles.pop(title)):
+                grams = self.grams[gram]
+                grams.discard(title)
+                if not grams:
+                    del self.grams[gram]
+            self.lows.discard(title)
+
+    # 📢 Deals with at least `min_discount`%, highest discount (then lowest price) first
+    def top_discounts(self, min_discount=0):
+        titles = []
+        for negative_discount, _, title in self.by_discount:
+            if -negative_discount < min_discount:
+                break
+            titles.append(title)
+        return titles
+
+    # 📢 Titles matching a query, best match first (then by discount); at most `limit` when given
+    # Candidates come from the trigram index and are checked on the titles without spaces.
+    def search(self, query, limit=None):
+        query = normalize_title(query)
+        if not query:
+            return []
+        cache_key = (query, limit)
+        cached = self.search_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        compact = query.replace(" ", "")
+        grams = trigrams(query)
+        if grams:
+            candidates = set.intersection(*(self.grams.get(gram, set()) for gram in grams))
+        else:
+            candidates = self.deals
+        matches = [title for title in candidates if compact in self.titles[title].replace(" ", "")]
+
+        def key(title):
+            return match_rank(query, self.titles[title]), self._sort_key(title, self.deals[title])
+
+        results = heapq.nsmallest(limit, matches, key=key) if limit else sorted(matches, key=key)
+        self.search_cache.put(cache_key, results)
+        return results
+
+    # 📢 Deals at their historic low, highest discount first
+    def historic_lows(self):
+        return sorted(self.lows, key=lambda title: self._sort_key(title, self.deals[title]))
+
+
+# 📢 Deal index of the first configured region (the current deals, loaded from the state files on first use)
+def get_index():
+    global _index
+    if _index is None:
+        from config import get_regions
+        from storage import load_current_deals, load_lows
+
+        region = get_regions()[0]
+        _index = DealIndex(load_current_deals(region), load_lows(region), region)
+    return _index
+
+
+# 📢 Update the index (when it was built) after a scrape: changed records in, ended sales out
+def update_index(games_by_region):
+    if _index is None or _index.region not in games_by_region:
+        return
+    from storage import load_current_titles, load_history, load_lows
+
+    current = load_current_titles(_index.region)
+    _index.remove([title for title in _index.deals if title not in current])
+    changed = {title: deal for title, deal in games_by_region[_index.region].items() if title in current}
+    returned = [title for title in current if title not in _index.deals and title not in changed]
+    if returned:
+        # Back on the pages with the same record as before (so not among the changed records)
+        history = load_history(_index.region)
+        changed.update((title, history[title]) for title in returned if title in history)
+    _index.update(changed, load_lows(_index.region))
@@ -0,0 +1,309 @@
+import re
+import sys
+import html
+import bisect
+import hashlib
+
+from config import CHANGE_MIN_DISCOUNT, CHANGE_MIN_DROP, CHANGE_COOLDOWN
+
+APPID_PATTERN = re.compile(r"/app/(\d+)")
+STORE_PATH_PATTERN = re.compile(r"^(https?://[^/]+/(?:app|sub|bundle)/)([^?#]*)(.*)$")
+PRICE_NUMBER_PATTERN = re.compile(r"\d(?:[\d.,'\s]*\d)?(?:[.,]--)?")
+FREE_WORDS = {"free", "free to play", "grátis", "gratuito"}
+
+# 📢 Platform bitmask
+PLATFORM_WINDOWS = 1
+PLATFORM_MAC = 2
+PLATFORM_LINUX = 4
+PLATFORM_BITS = {"win": PLATFORM_WINDOWS, "mac": PLATFORM_MAC, "linux": PLATFORM_LINUX}
+
+# 📢 Review count buckets: 0 = no reviews, 1 = under 10, ..., 6 = 50000 or more
+REVIEW_BUCKET_LIMITS = (10, 50, 500, 5000, 50000)
+
+# Per-app fields (same in every region): kept in app_metadata.json for region state files
+APP_FIELDS = ("review_percent", "review_bucket", "tags", "platforms")
+
+# 📢 Shared price formats: one instance per currency layout, used by every deal
+_PRICE_FORMATS = {}
+
+# 📢 Shared tag id objects, so deals with the same tags don't each hold their own ints
+_TAG_IDS = {}
+
+
+# 📢 How a currency is written (symbol position and separators)
+class PriceFormat:
+    __slots__ = ("prefix", "suffix", "decimal_sep", "thousands_sep", "dash_zero")
+
+    def __init__(self, prefix, suffix, decimal_sep, thousands_sep, dash_zero):
+        self.prefix = prefix
+        self.suffix = suffix
+        self.decimal_sep = decimal_sep
+        self.thousands_sep = thousands_sep
+        self.dash_zero = dash_zero
+
+    @property
+    def symbol(self):
+        return (self.prefix + self.suffix).strip()
+
+    def format(self, cents):
+        if cents is None:
+            return "N/A"
+        if cents == 0:
+            return "Free"
+        units = str(cents // 100)
+        if self.thousands_sep:
+            groups = []
+            while len(units) > 3:
+                groups.insert(0, units[-3:])
+                units = units[:-3]
+            units = self.thousands_sep.join([units] + groups)
+        if self.decimal_sep:
+            fraction = cents % 100
+            units += self.decimal_sep + ("--" if self.dash_zero and fraction == 0 else f"{fraction:02d}")
+        return f"{self.prefix}{units}{self.suffix}"
+
+
+# 📢 Get the shared PriceFormat for a currency layout
+def get_price_format(prefix, suffix, decimal_sep="", thousands_sep="", dash_zero=False):
+    key = (prefix, suffix, decimal_sep, thousands_sep, dash_zero)
+    price_format = _PRICE_FORMATS.get(key)
+    if price_format is None:
+        price_format = _PRICE_FORMATS[key] = PriceFormat(
+            sys.intern(prefix), sys.intern(suffix), decimal_sep, thousands_sep, dash_zero
+        )
+    return price_format
+
+
+# 📢 Parse a price like "19,99€", "$1,299.99" or "20,--€" into (cents, PriceFormat)
+def parse_price(text):
+    text = text.strip()
+    match = PRICE_NUMBER_PATTERN.search(text)
+    if not match:
+        return (0 if text.lower() in FREE_WORDS else None), None
+
+    number = match.group()
+    dash_zero = number.endswith("--")
+    if dash_zero:
+        number = number[:-2] + "00"
+
+    separators = [c for c in number if not c.isdigit()]
+    decimal_sep = ""
+    if separators and len(number) - number.rfind(separators[-1]) - 1 == 2:
+        decimal_sep = separators[-1]
+    thousands_sep = next((c for c in separators if c != decimal_sep), "")
+
+    value = int("".join(c for c in number if c.isdigit()))
+    cents = value if decimal_sep else value * 100
+    return cents, get_price_format(text[:match.start()], text[match.end():], decimal_sep, thousands_sep, dash_zero)
+
+
+# 📢 Parse a discount like "-60%" into 60
+def parse_discount(text):
+    digits = "".join(filter(str.isdigit, text))
+    return int(digits) if digits else 0
+
+
+# 📢 Bucket of a review count (see REVIEW_BUCKET_LIMITS)
+def review_bucket(count):
+    if not count:
+        return 0
+    return 1 + bisect.bisect_right(REVIEW_BUCKET_LIMITS, count)
+
+
+# 📢 Tuple of shared tag id ints
+def intern_tag_ids(tag_ids):
+    return tuple(_TAG_IDS.setdefault(tag_id, tag_id) for tag_id in tag_ids)
+
+
+# 📢 A Steam deal: integer prices, shared (interned) currency and URL prefixes
+class Deal:
+    __slots__ = (
+        "appid", "name", "discount", "original_cents", "current_cents",
+        "price_format", "url_prefix", "url_path", "url_suffix", "date",
+        "review_percent", "review_bucket", "tag_ids", "platforms",
+    )
+
+    def __init__(self, name, discount, original_cents, current_cents, price_format, link, appid=None, date=None,
+                 review_percent=None, review_bucket=0, tag_ids=(), platforms=0):
+        self.name = sys.intern(name)
+        self.discount = discount
+        self.original_cents = original_cents
+        self.current_cents = current_cents
+        self.price_format = price_format or get_price_format("", "")
+        match = STORE_PATH_PATTERN.match(link)
+        if match:
+            self.url_prefix = sys.intern(match.group(1))
+            self.url_path = match.group(2)
+            self.url_suffix = sys.intern(match.group(3))
+        else:
+            self.url_prefix, self.url_path, self.url_suffix = "", link, ""
+        self.appid = appid if appid is not None else get_appid(link)
+        self.date = sys.intern(date) if date else None
+        self.review_percent = review_percent
+        self.review_bucket = review_bucket
+        self.tag_ids = intern_tag_ids(tag_ids) if tag_ids else ()
+        self.platforms = platforms
+
+    @property
+    def link(self):
+        return self.url_prefix + self.url_path + self.url_suffix
+
+    @property
+    def original_price(self):
+        return self.price_format.format(self.original_cents)
+
+    @property
+    def current_price(self):
+        return self.price_format.format(self.current_cents)
+
+    @property
+    def discount_text(self):
+        return f"-{self.discount}%" if self.discount else "0%"
+
+    @property
+    def free_to_keep(self):
+        return self.discount >= 100 or (self.current_cents == 0 and bool(self.original_cents))
+
+    # 📢 Build a Deal from the scraped text fields
+    @classmethod
+    def from_text(cls, name, discount, original_price, current_price, link, date=None, **fields):
+        original_cents, original_format = parse_price(original_price)
+        current_cents, current_format = parse_price(current_price)
+        return cls(
+            name, parse_discount(discount), original_cents, current_cents,
+            original_format or current_format, link, date=date, **fields,
+        )
+
+    # 📢 Build a Deal from a JSON state record
+    @classmethod
+    def from_dict(cls, data):
+        return cls.from_text(
+            data["name"], data["discount"], data["original_price"], data["current_price"],
+            data["link"], date=data.get("date"),
+            review_percent=data.get("review_percent"),
+            review_bucket=data.get("review_bucket", 0),
+            tag_ids=data.get("tags", ()),
+            platforms=data.get("platforms", 0),
+        )
+
+    # 📢 Convert to the JSON state record (same fields as the scraped text)
+    def to_dict(self):
+        data = {
+            "name": self.name,
+            "discount": self.discount_text,
+            "original_price": self.original_price,
+            "current_price": self.current_price,
+            "link": self.link,
+        }
+        if self.date:
+            data["date"] = self.date
+        if self.review_percent is not None:
+            data["review_percent"] = self.review_percent
+        if self.review_bucket:
+            data["review_bucket"] = self.review_bucket
+        if self.tag_ids:
+            data["tags"] = list(self.tag_ids)
+        if self.platforms:
+            data["platforms"] = self.platforms
+        return data
+
+    # 📢 Content hash of the fields that matter for change detection
+    def fingerprint(self):
+        content = (
+            f"{self.discount}|{self.original_cents}|{self.current_cents}|{self.price_format.symbol}|{self.link}|"
+            f"{self.review_percent}|{self.review_bucket}|{self.tag_ids}|{self.platforms}"
+        )
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=8).hexdigest()
+
+    def __eq__(self, other):
+        if not isinstance(other, Deal):
+            return NotImplemented
+        return (self.name, self.discount, self.original_cents, self.current_cents, self.link) == (
+            other.name, other.discount, other.original_cents, other.current_cents, other.link)
+
+    def __repr__(self):
+        return f"Deal({self.name!r}, -{self.discount}%, {self.current_price})"
+
+
+# 📢 Get the Steam appid from a store link (None for bundles and packages)
+def get_appid(link):
+    match = APPID_PATTERN.search(link)
+    return int(match.group(1)) if match else None
+
+# 📢 Format game message
+def format_game_message(deal, region=""):
+    region_line = f"🌍 Region: {region.upper()}\n" if region else ""
+    return (
+        f"🎮 {deal.name}\n"
+        f"{region_line}"
+        f"💰 Original Price: {deal.original_price}\n"
+        f"🔥 Current Price: {deal.current_price}\n"
+        f"🛍️ Discount: {deal.discount_text}\n"
+        f"🔗 <a href='{deal.link}'>View on Steam</a>"
+    )
+
+# 📢 One-line summary of a deal (digests and lists)
+def format_deal_line(deal, bullet="•"):
+    return f"{bullet} <a href='{deal.link}'>{html.escape(deal.name)}</a> {deal.discount_text} → {deal.current_price}"
+
+# 📢 Filter the history down to the best deals (global filter rules unless a predicate is given)
+def select_best_deals(history, predicate=None):
+    from filters import apply_filter, get_default_filter, load_filter_rules
+    from columnar import use_columns, filter_deals
+
+    if predicate is None and use_columns(len(history)):
+        return filter_deals(history, load_filter_rules())
+    return apply_filter(predicate or get_default_filter(), history)
+
+# 📢 Add deals to a queue; a newer record of the same game (appid) replaces the queued one
+def merge_deals(queue, new_deals):
+    queued_titles = {deal.appid: title for title, deal in queue.items() if deal.appid}
+    for title, deal in new_deals.items():
+        queued_title = queued_titles.get(deal.appid) if deal.appid else None
+        if queued_title is not None and queued_title != title:
+            del queue[queued_title]
+        queue[title] = deal
+    return queue
+
+# 📢 How a deal compares to the discount and price it was last sent with:
+# "better" when the discount grew CHANGE_MIN_DISCOUNT points or the price dropped CHANGE_MIN_DROP %,
+# "worse" when the price went up (or the discount down at the same price), None for smaller changes
+def price_change(deal, discount, current_cents):
+    if deal.discount - discount >= max(CHANGE_MIN_DISCOUNT, 1):
+        return "better"
+    price = deal.current_cents
+    priced = price is not None and current_cents is not None
+    if priced and price < current_cents:
+        return "better" if (current_cents - price) * 100 >= CHANGE_MIN_DROP * current_cents else None
+    if priced and price > current_cents:
+        return "worse"
+    return "worse" if deal.discount < discount else None
+
+# 📢 Whether a game sent at `sent_at` (epoch seconds) is still in its CHANGE_COOLDOWN
+def in_cooldown(sent_at, now):
+    return bool(sent_at) and now - sent_at < CHANGE_COOLDOWN * 3600
+
+# 📢 Queued deals that can be sent now: a game sent within CHANGE_COOLDOWN stays queued until it ends
+# (`sent_at(title, deal)`: when the game was last sent, None when never)
+def ready_deals(queue, sent_at, now):
+    return {title: deal for title, deal in queue.items() if not in_cooldown(sent_at(title, deal), now)}
+
+# 📢 Compare deals to the ones last sent: (new or significantly better deals, deals that got worse)
+def find_price_changes(best_deals, previous_best_deals):
+    from columnar import use_columns, find_changed_deals
+
+    if use_columns(len(best_deals)):
+        return find_changed_deals(best_deals, previous_best_deals)
+    new_deals, worse_deals = {}, {}
+    for title, deal in best_deals.items():
+        previous = previous_best_deals.get(title)
+        change = "better" if previous is None else price_change(deal, previous.discount, previous.current_cents)
+        if change == "better":
+            new_deals[title] = deal
+        elif change == "worse":
+            worse_deals[title] = deal
+    return new_deals, worse_deals
+
+# 📢 Keep only deals that are new or significantly better than when they were last sent
+def find_new_deals(best_deals, previous_best_deals):
+    return find_price_changes(best_deals, previous_best_deals)[0]
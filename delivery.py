@@ -0,0 +1,115 @@
+import time
+import asyncio
+import logging
+
+from config import (
+    MESSAGE_INTERVAL, RANK_TOP_K, RANK_DIGEST, LEADERBOARD, DEAL_PHOTOS, RUN_DEADLINE, SEND_MARGIN,
+    TELEGRAM_TIMEOUT, SEND_ATTEMPTS, SEND_RETRY_DELAY,
+)
+from deals import format_game_message
+from ranking import top_deals, format_digest
+from telegram_sender import send_telegram_message
+
+# Delivery of a set of deals to one chat, shared by the region chats and the subscriptions.
+# Deals leave the queue by score, best first, within the run deadline (RUN_DEADLINE): when time runs
+# short the unsent top deals go out in one digest and the lower ranked ones stay queued for the next run.
+
+# 📢 Longest a send_telegram_message call can take: every attempt times out (connect, write and read),
+# with the delays between attempts. A message is only started when this fits before the deadline.
+SEND_WORST_CASE = SEND_ATTEMPTS * 3 * TELEGRAM_TIMEOUT + (SEND_ATTEMPTS - 1) * SEND_RETRY_DELAY
+
+# 📢 Wall-clock time (time.monotonic) by which the run must be done (None: no deadline)
+_deadline = None
+
+
+# 📢 Start the deadline of a run (call once at the start of the run)
+def start_deadline(seconds=RUN_DEADLINE):
+    global _deadline
+    _deadline = time.monotonic() + seconds if seconds else None
+
+
+# 📢 Whether there is still time for something taking `seconds` (SEND_MARGIN kept free)
+def has_time(seconds=0):
+    return _deadline is None or time.monotonic() + seconds + SEND_MARGIN <= _deadline
+
+
+# 📢 Send deals (titles, best first) in digest messages while the deadline allows; returns the titles shown.
+# A digest cut at the Telegram message limit goes on in another message; what isn't shown stays queued.
+async def send_digest(deals, titles, chat_id, region="", title=None):
+    shown_titles = []
+    while len(shown_titles) < len(titles) and has_time(SEND_WORST_CASE):
+        if shown_titles:
+            await asyncio.sleep(MESSAGE_INTERVAL)
+        remaining = titles[len(shown_titles):]
+        text, shown = format_digest([deals[t] for t in remaining], region, title)
+        if not shown or not await send_telegram_message(text, chat_id=chat_id):
+            break
+        shown_titles.extend(remaining[:shown])
+    return shown_titles
+
+
+# 📢 Send deals to a chat, best first, and return the titles that were handled
+# Only the top RANK_TOP_K are sent one by one (photo posts with DEAL_PHOTOS); the rest go out in one
+# digest (RANK_DIGEST) or are handled silently. With `limit`, at most `limit` deals are sent and the rest are left alone.
+# With LEADERBOARD=only no message is sent: every deal is handled and shows up in the leaderboard
+# (whose first message also waits for the end of the quiet hours, see leaderboard.py).
+# `schedule` is the chat's quiet hours (see quiet_hours.py): while quiet nothing is sent, and the first
+# delivery after the window opens is one digest of everything that was held back.
+async def deliver_deals(deals, chat_id, region="", lows=None, limit=None, schedule=None):
+    from quiet_hours import is_quiet, is_deferred, defer_chat, clear_deferred
+
+    if LEADERBOARD == "only":
+        return list(deals)
+    if is_quiet(schedule):
+        defer_chat(chat_id, len(deals))
+        return []
+    if is_deferred(chat_id):
+        if not has_time(SEND_WORST_CASE):
+            logging.warning(f"⏰ Run deadline reached: the quiet hours digest of chat {chat_id} stays queued.")
+            return []
+        # With `limit` the digest holds the top `limit` deals and the rest stay queued. A long digest takes
+        # several messages; what the deadline leaves out stays queued and the chat stays deferred.
+        titles, _ = top_deals(deals, limit, lows)
+        shown = await send_digest(deals, titles, chat_id, region, f"🌅 {len(titles)} deals found during quiet hours")
+        if len(shown) == len(titles):
+            clear_deferred(chat_id)
+        return shown
+
+    titles, rest = top_deals(deals, limit or RANK_TOP_K, lows)
+
+    if DEAL_PHOTOS:
+        from media import send_deal_posts
+        delivered, unsent = await send_deal_posts(deals, titles, chat_id, region)
+    else:
+        delivered, unsent = [], []
+        for position, title in enumerate(titles):
+            if not has_time(MESSAGE_INTERVAL + SEND_WORST_CASE):
+                unsent = titles[position:]
+                break
+            deal = deals[title]
+            sent = await send_telegram_message(format_game_message(deal, region), appid=deal.appid, chat_id=chat_id)
+            if sent:
+                delivered.append(title)
+            await asyncio.sleep(MESSAGE_INTERVAL)
+
+    if unsent:
+        # Deadline: the unsent top deals in a digest, the lower ranked ones stay queued
+        shown = await send_digest(deals, unsent, chat_id, region)
+        delivered.extend(shown)
+        left = len(unsent) - len(shown) + len(rest)
+        if shown:
+            logging.warning(f"⏰ Run deadline near: {len(shown)} promotions sent in a digest, {left} left queued.")
+        else:
+            logging.warning(f"⏰ Run deadline reached: {left} promotions left queued.")
+        return delivered
+
+    if rest and not limit and has_time(SEND_WORST_CASE):
+        if RANK_DIGEST:
+            ranked, _ = top_deals(rest, lows=lows)
+            shown = await send_digest(rest, ranked, chat_id, region)
+            logging.info(f"📋 {len(shown)} lower ranked promotions sent in a digest, {len(rest) - len(shown)} left queued.")
+            delivered.extend(shown)
+        else:
+            logging.info(f"📋 {len(rest)} lower ranked promotions skipped.")
+            delivered.extend(rest)
+    return delivered
@@ -0,0 +1,110 @@
+import time
+import asyncio
+import logging
+
+from config import (
+    APP_DETAILS_FILE, APP_DETAILS_URL, ENRICHMENT_TTL, ENRICHMENT_ERROR_TTL,
+    ENRICHMENT_BATCH_SIZE, ENRICHMENT_CONCURRENCY, ENRICHMENT_MAX_PER_RUN,
+)
+from storage import load_json, save_json
+
+# Steam only accepts several appids per appdetails call with filters=price_overview, so a
+# "batch" is a group of single-appid calls run concurrently, with a pause between batches.
+APP_DETAILS_FILTERS = "basic,genres,release_date,metacritic"
+BATCH_PAUSE = 1.0
+
+# 📢 In-memory copy of the app details cache
+_cache = None
+
+
+# 📢 Load the app details cache ({appid: details})
+def load_app_details():
+    global _cache
+    if _cache is None:
+        _cache = load_json(APP_DETAILS_FILE, "App details")
+    return _cache
+
+
+# 📢 Cached details of an app (None when never fetched or not available)
+def get_app_details(appid):
+    entry = load_app_details().get(str(appid))
+    if not entry or entry.get("missing") or entry.get("error"):
+        return None
+    return entry
+
+
+# 📢 Appids that have never been fetched or whose cache entry expired
+def stale_appids(appids, cache, now):
+    stale = []
+    for appid in appids:
+        entry = cache.get(str(appid))
+        if entry is None:
+            stale.append(appid)
+            continue
+        ttl = ENRICHMENT_ERROR_TTL if entry.get("error") else ENRICHMENT_TTL
+        if now - entry["fetched_at"] >= ttl:
+            stale.append(appid)
+    return stale
+
+
+# 📢 Keep only the fields we use from an appdetails response
+def compact_details(data):
+    metacritic = data.get("metacritic") or {}
+    return {
+        "genres": [genre["description"] for genre in data.get("genres", [])],
+        "release_date": (data.get("release_date") or {}).get("date"),
+        "coming_soon": (data.get("release_date") or {}).get("coming_soon", False),
+        "metacritic": metacritic.get("score"),
+        "header_image": data.get("header_image"),
+    }
+
+
+# 📢 Fetch the details of one app (blocking, runs in a thread)
+def fetch_app_details(appid):
+    from http_cache import get_session
+
+    now = time.time()
+    try:
+        response = get_session().get(
+            APP_DETAILS_URL, params={"appids": appid, "filters": APP_DETAILS_FILTERS}, timeout=30
+        )
+        if response.status_code != 200:
+            logging.warning(f"⚠️ appdetails returned {response.status_code}", extra={"appid": appid, "error": f"HTTP{response.status_code}"})
+            return {"fetched_at": now, "error": True}
+        result = (response.json() or {}).get(str(appid)) or {}
+    except Exception as e:
+        logging.warning(f"⚠️ Error fetching app details: {e}", extra={"appid": appid, "error": type(e).__name__})
+        return {"fetched_at": now, "error": True}
+
+    if not result.get("success"):
+        return {"fetched_at": now, "missing": True}
+    return dict(compact_details(result.get("data") or {}), fetched_at=now)
+
+
+# 📢 Enrich deals with cached app details, fetching only new or stale appids
+async def enrich_deals(deals):
+    cache = load_app_details()
+    appids = sorted({deal.appid for deal in deals if deal.appid})
+    all_stale = stale_appids(appids, cache, time.time())
+    stale = all_stale[:ENRICHMENT_MAX_PER_RUN]
+    if not stale:
+        logging.info(f"💾 App details of {len(appids)} apps already cached.")
+        return 0
+
+    semaphore = asyncio.Semaphore(ENRICHMENT_CONCURRENCY)
+
+    async def fetch(appid):
+        async with semaphore:
+            cache[str(appid)] = await asyncio.to_thread(fetch_app_details, appid)
+
+    for start in range(0, len(stale), ENRICHMENT_BATCH_SIZE):
+        if start:
+            await asyncio.sleep(BATCH_PAUSE)
+        await asyncio.gather(*(fetch(appid) for appid in stale[start:start + ENRICHMENT_BATCH_SIZE]))
+
+    save_json(APP_DETAILS_FILE, cache)
+    logging.info(
+        f"🧩 Fetched app details of {len(stale)} apps ({len(appids) - len(all_stale)} from cache, "
+        f"{len(all_stale) - len(stale)} left for the next run)."
+    )
+    return len(stale)
@@ -0,0 +1,140 @@
+import os
+import json
+import logging
+
+from config import DISCOUNT_FILTER, FILTERS_FILE
+from deals import PLATFORM_BITS
+
+# Filter rules are a plain dict (from the environment, filters.json or a subscription):
+#   min_discount, min_price, max_price (in currency units), min_review_percent, min_review_bucket,
+#   include_tags (any of), exclude_tags, platforms (any of "win", "mac", "linux"),
+#   allow_appids (always pass), deny_appids (always rejected)
+# compile_filter() turns them into one predicate, a tuple of checks evaluated once per deal.
+
+RULE_KEYS = (
+    "min_discount", "min_price", "max_price", "min_review_percent", "min_review_bucket",
+    "include_tags", "exclude_tags", "platforms", "allow_appids", "deny_appids",
+)
+LIST_RULES = ("include_tags", "exclude_tags", "platforms", "allow_appids", "deny_appids")
+
+_default_filter = None
+
+ENV_RULES = {
+    "min_discount": "DESCONTO_MINIMO",
+    "min_price": "FILTER_MIN_PRICE",
+    "max_price": "FILTER_MAX_PRICE",
+    "min_review_percent": "FILTER_MIN_REVIEW",
+    "min_review_bucket": "FILTER_MIN_REVIEW_BUCKET",
+    "include_tags": "FILTER_INCLUDE_TAGS",
+    "exclude_tags": "FILTER_EXCLUDE_TAGS",
+    "platforms": "FILTER_PLATFORMS",
+    "allow_appids": "FILTER_ALLOW_APPIDS",
+    "deny_appids": "FILTER_DENY_APPIDS",
+}
+
+
+# 📢 Parse a comma separated list ("1662, 492")
+def _split(value):
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return list(value)
+    return [item.strip() for item in str(value).split(",") if item.strip()]
+
+
+# 📢 Normalize a rules dict: known keys only, numbers and lists in their final types
+def normalize_rules(rules):
+    normalized = {}
+    for key in RULE_KEYS:
+        value = rules.get(key)
+        if value is None or value == "" or value == []:
+            continue
+        if key == "platforms":
+            normalized[key] = sorted({platform.lower() for platform in _split(value)})
+        elif key in LIST_RULES:
+            normalized[key] = sorted({int(item) for item in _split(value)})
+        elif key in ("min_price", "max_price"):
+            normalized[key] = float(value)
+        else:
+            normalized[key] = int(value)
+    unknown = set(rules) - set(RULE_KEYS)
+    if unknown:
+        logging.warning(f"⚠️ Unknown filter rules ignored: {', '.join(sorted(unknown))}")
+    return normalized
+
+
+# 📢 Global filter rules: defaults, then filters.json, then environment variables
+def load_filter_rules():
+    rules = {"min_discount": DISCOUNT_FILTER}
+    if os.path.exists(FILTERS_FILE):
+        try:
+            with open(FILTERS_FILE, "r", encoding="utf-8") as file:
+                rules.update(json.load(file))
+        except json.JSONDecodeError as e:
+            logging.error(f"❌ Invalid {FILTERS_FILE}: {e}", extra={"error": type(e).__name__})
+    for key, variable in ENV_RULES.items():
+        if os.getenv(variable):
+            rules[key] = os.getenv(variable)
+    return normalize_rules(rules)
+
+
+# 📢 Hashable form of normalized rules (identical rules -> identical key)
+def rules_key(rules):
+    return json.dumps(rules, sort_keys=True)
+
+
+# 📢 Compile rules into a single predicate: deal -> bool (a tuple of checks, stopping at the first failure)
+def compile_filter(rules):
+    rules = normalize_rules(rules)
+    checks = [lambda deal: deal.original_cents is not None]
+
+    if "deny_appids" in rules:
+        deny_appids = frozenset(rules["deny_appids"])
+        checks.insert(0, lambda deal: deal.appid not in deny_appids)
+    if "min_discount" in rules:
+        min_discount = rules["min_discount"]
+        checks.append(lambda deal: deal.discount >= min_discount)
+    if "min_price" in rules:
+        min_cents = round(rules["min_price"] * 100)
+        checks.append(lambda deal: (deal.current_cents or 0) >= min_cents)
+    if "max_price" in rules:
+        max_cents = round(rules["max_price"] * 100)
+        checks.append(lambda deal: (deal.current_cents or 0) <= max_cents)
+    if "min_review_percent" in rules:
+        min_review_percent = rules["min_review_percent"]
+        checks.append(lambda deal: (deal.review_percent or 0) >= min_review_percent)
+    if "min_review_bucket" in rules:
+        min_review_bucket = rules["min_review_bucket"]
+        checks.append(lambda deal: deal.review_bucket >= min_review_bucket)
+    if "include_tags" in rules:
+        include_tags = frozenset(rules["include_tags"])
+        checks.append(lambda deal: not include_tags.isdisjoint(deal.tag_ids))
+    if "exclude_tags" in rules:
+        exclude_tags = frozenset(rules["exclude_tags"])
+        checks.append(lambda deal: exclude_tags.isdisjoint(deal.tag_ids))
+    if "platforms" in rules:
+        platform_mask = sum(PLATFORM_BITS.get(platform, 0) for platform in rules["platforms"])
+        checks.append(lambda deal: bool(deal.platforms & platform_mask))
+    checks = tuple(checks)
+
+    def predicate(deal):
+        for check in checks:
+            if not check(deal):
+                return False
+        return True
+
+    if "allow_appids" in rules:
+        allow_appids = frozenset(rules["allow_appids"])
+        return lambda deal: deal.appid in allow_appids or predicate(deal)
+    return predicate
+
+
+# 📢 Predicate of the global filter rules (compiled once per process)
+def get_default_filter():
+    global _default_filter
+    if _default_filter is None:
+        _default_filter = compile_filter(load_filter_rules())
+    return _default_filter
+
+
+# 📢 Keep the deals that match a predicate, in a single pass
+def apply_filter(predicate, deals):
+    return {title: deal for title, deal in deals.items() if predicate(deal)}
@@ -0,0 +1,90 @@
+import time
+import asyncio
+import logging
+
+from config import FREE_LATENCY_TARGET
+from deals import format_game_message, select_best_deals, find_new_deals, price_change
+from storage import (
+    load_best_deals, save_best_deals, load_outbox, save_outbox, load_notified, save_notified,
+    load_subscription_outbox, save_subscription_outbox, load_subscription_sent, save_subscription_sent,
+)
+from subscriptions import region_subscriptions, match_subscriptions
+from telegram_sender import send_telegram_message, get_region_chat_id
+
+# Free-to-keep deals (-100%) are the most valuable and the shortest lived. The scraper hands them over
+# as soon as their page is parsed, and they are sent right away to the region chat and the matching
+# subscribed chats: no queue, no ranking or digest, no quiet hours. Each message logs its latency from
+# the page fetch (duration_ms), with a warning above FREE_LATENCY_TARGET.
+
+FREE_HEADER = "🆓 <b>Free to keep!</b>\n"
+
+# 📢 Regions crawl at the same time: one fast path at a time, so the shared state files stay consistent
+_lock = None
+
+
+def free_lock():
+    global _lock
+    if _lock is None:
+        _lock = asyncio.Lock()
+    return _lock
+
+
+# 📢 Send one free deal and log its fetch-to-delivery latency
+async def send_free_deal(deal, chat_id, region, fetched_at):
+    message = await send_telegram_message(FREE_HEADER + format_game_message(deal, region), appid=deal.appid, chat_id=chat_id)
+    if message:
+        latency_ms = round((time.monotonic() - fetched_at) * 1000, 1)
+        if latency_ms > FREE_LATENCY_TARGET * 1000:
+            logging.warning(f"🐢 Free deal delivered {latency_ms} ms after the fetch (target {FREE_LATENCY_TARGET} s).",
+                            extra={"appid": deal.appid, "duration_ms": latency_ms})
+        else:
+            logging.info(f"🆓 Free deal delivered {latency_ms} ms after the fetch.",
+                         extra={"appid": deal.appid, "duration_ms": latency_ms})
+    return message
+
+
+# 📢 Send new free deals of a region now, and record them so the regular queue doesn't send them again
+async def send_free_deals(region, deals, fetched_at):
+    async with free_lock():
+        now = int(time.time())
+        delivered = 0
+
+        best_deals = load_best_deals(region)
+        fresh = find_new_deals(select_best_deals(deals), best_deals)
+        if fresh:
+            chat_id = get_region_chat_id(region)
+            outbox = load_outbox(region)
+            notified = load_notified(region)
+            for title, deal in fresh.items():
+                if await send_free_deal(deal, chat_id, region, fetched_at):
+                    best_deals[title] = deal
+                    notified[str(deal.appid or title)] = now
+                    outbox.pop(title, None)
+                    delivered += 1
+            save_best_deals(best_deals, region)
+            save_outbox(outbox, region)
+            save_notified(notified, region)
+
+        subscriptions = region_subscriptions(region)
+        if subscriptions:
+            subscription_outbox = load_subscription_outbox()
+            sent = load_subscription_sent()
+            for chat_id, matched in match_subscriptions(deals, subscriptions).items():
+                chat_sent = sent.setdefault(chat_id, {})
+                for title, deal in matched.items():
+                    previous = chat_sent.get(title)
+                    if previous and price_change(deal, previous[0], previous[1]) != "better":
+                        continue
+                    if await send_free_deal(deal, chat_id, region, fetched_at):
+                        chat_sent[title] = [deal.discount, deal.current_cents, now]
+                        subscription_outbox.get(chat_id, {}).pop(title, None)
+                        delivered += 1
+                if not chat_sent:
+                    del sent[chat_id]
+                if chat_id in subscription_outbox and not subscription_outbox[chat_id]:
+                    del subscription_outbox[chat_id]
+            save_subscription_outbox(subscription_outbox)
+            save_subscription_sent(sent)
+
+        logging.info(f"🆓 {delivered} free-to-keep promotions sent right away ({region.upper() or 'default'}).")
+        return delivered
@@ -0,0 +1,125 @@
+import os
+import re
+import json
+import time
+import hashlib
+import logging
+import threading
+
+from config import HTTP_CACHE_DIR, HTTP_CACHE_TTL
+
+# Small on-disk HTTP cache: bodies are reused without a request while fresh, and
+# revalidated with If-None-Match / If-Modified-Since once stale.
+
+MAX_AGE_PATTERN = re.compile(r"max-age=(\d+)")
+
+_session = None
+_url_locks = {}
+_url_locks_guard = threading.Lock()
+
+
+# 📢 Get the shared requests session (keeps connections alive between pages)
+def get_session():
+    global _session
+    if _session is None:
+        import requests
+        _session = requests.Session()
+    return _session
+
+
+# 📢 One lock per URL, so concurrent fetches of the same URL make a single request
+def _lock_for(url):
+    with _url_locks_guard:
+        return _url_locks.setdefault(url, threading.Lock())
+
+
+# 📢 Paths of the metadata and body files of a cached URL
+def _entry_paths(url):
+    key = hashlib.sha1(url.encode("utf-8")).hexdigest()
+    base = os.path.join(HTTP_CACHE_DIR, key)
+    return base + ".json", base + ".body"
+
+
+# 📢 Load a cache entry (metadata, body) or (None, None)
+def _load_entry(url):
+    meta_path, body_path = _entry_paths(url)
+    try:
+        with open(meta_path, "r", encoding="utf-8") as file:
+            meta = json.load(file)
+        with open(body_path, "r", encoding="utf-8") as file:
+            return meta, file.read()
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None, None
+
+
+# 📢 Write a file atomically
+def _write_atomic(path, content):
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as file:
+        file.write(content)
+    os.replace(tmp_path, path)
+
+
+# 📢 Save a cache entry
+def _save_entry(url, meta, body=None):
+    os.makedirs(HTTP_CACHE_DIR, exist_ok=True)
+    meta_path, body_path = _entry_paths(url)
+    if body is not None:
+        _write_atomic(body_path, body)
+    _write_atomic(meta_path, json.dumps(meta))
+
+
+# 📢 Freshness lifetime of a response: our TTL, or a longer Cache-Control max-age
+# (the TTL applies even without max-age, so several consumers polling within it share one fetch)
+def _ttl_from_headers(headers, default_ttl):
+    match = MAX_AGE_PATTERN.search(headers.get("Cache-Control", ""))
+    return max(int(match.group(1)), default_ttl) if match else default_ttl
+
+
+# 📢 Fetch a URL as text through the cache (None on error, or the stale cached body when there is one)
+def fetch_text(url, headers=None, ttl=HTTP_CACHE_TTL):
+    with _lock_for(url):
+        meta, body = _load_entry(url)
+        now = time.time()
+
+        if meta and now - meta["fetched_at"] < meta["ttl"]:
+            logging.info(f"💾 Using cached response for {url} ({now - meta['fetched_at']:.0f}s old).")
+            return body
+
+        request_headers = dict(headers or {})
+        if meta and meta.get("etag"):
+            request_headers["If-None-Match"] = meta["etag"]
+        if meta and meta.get("last_modified"):
+            request_headers["If-Modified-Since"] = meta["last_modified"]
+
+        import requests
+
+        try:
+            response = get_session().get(url, headers=request_headers, timeout=30)
+        except requests.RequestException as e:
+            if body is not None:
+                logging.warning(f"⚠️ Error accessing {url}: {e}. Reusing the stale cached body.", extra={"error": type(e).__name__})
+                return body
+            logging.error(f"❌ Error accessing {url}: {e}", extra={"error": type(e).__name__})
+            return None
+
+        if response.status_code == 304 and meta:
+            logging.info(f"💾 {url} not modified. Reusing cached body.")
+            meta["fetched_at"] = now
+            meta["ttl"] = _ttl_from_headers(response.headers, ttl)
+            _save_entry(url, meta)
+            return body
+
+        if response.status_code != 200:
+            logging.error(f"Error accessing Steam: {response.status_code}", extra={"error": f"HTTP{response.status_code}"})
+            return None
+
+        meta = {
+            "url": url,
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "fetched_at": now,
+            "ttl": _ttl_from_headers(response.headers, ttl),
+        }
+        _save_entry(url, meta, response.text)
+        return response.text
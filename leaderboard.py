@@ -0,0 +1,77 @@
+import hashlib
+import logging
+
+from config import LEADERBOARD_SIZE
+from deals import format_deal_line
+from ranking import top_deals
+from storage import load_leaderboards, save_leaderboards
+from telegram_sender import send_telegram_message, edit_telegram_message, pin_telegram_message
+
+# One pinned "Top N current deals" message per chat, rebuilt from the ranking after every run and
+# edited in place. leaderboards.json keeps {chat_id: {"message_id", "digest"}}; a run whose text is
+# identical to the last one makes no API call at all.
+
+
+# 📢 Text of a leaderboard (no timestamp, so an unchanged ranking renders the same text)
+def render_leaderboard(deals, region="", lows=None, size=LEADERBOARD_SIZE):
+    titles, _ = top_deals(deals, size, lows)
+    region_text = f" ({region.upper()})" if region else ""
+    lines = [f"🏆 Top {len(titles)} current deals{region_text}"]
+    lines.extend(format_deal_line(deals[title], f"{position}.") for position, title in enumerate(titles, 1))
+    return "\n".join(lines)
+
+
+# 📢 Update the leaderboard of a chat: skipped when unchanged, edited in place, or sent and pinned
+# Edits are silent, but a new message notifies the chat: during its quiet hours (`schedule`) it waits.
+async def update_leaderboard(chat_id, deals, region="", lows=None, schedule=None):
+    from quiet_hours import is_quiet
+
+    if not chat_id or not deals:
+        return "skipped"
+    text = render_leaderboard(deals, region, lows)
+    digest = hashlib.blake2b(text.encode("utf-8"), digest_size=8).hexdigest()
+
+    leaderboards = load_leaderboards()
+    state = leaderboards.get(str(chat_id), {})
+    if state.get("digest") == digest:
+        return "unchanged"
+
+    if state.get("message_id") and await edit_telegram_message(chat_id, state["message_id"], text):
+        result = "edited"
+    else:
+        # First leaderboard of the chat, or the old message can't be edited anymore (deleted)
+        if is_quiet(schedule):
+            logging.info(f"🌙 Leaderboard of chat {chat_id} waits for the end of its quiet hours.")
+            return "quiet"
+        message = await send_telegram_message(text, chat_id=chat_id)
+        if not message:
+            return "failed"
+        state["message_id"] = message.message_id
+        await pin_telegram_message(chat_id, message.message_id)
+        result = "sent"
+
+    state["digest"] = digest
+    leaderboards[str(chat_id)] = state
+    save_leaderboards(leaderboards)
+    logging.info(f"🏆 Leaderboard {result} in chat {chat_id}.")
+    return result
+
+
+# 📢 Update the leaderboards of a region: its chat (global filter) and its subscribed chats (their filters)
+# Only the deals on the specials pages at the last crawl are ranked: sales that ended leave the leaderboard.
+async def update_region_leaderboards(region=""):
+    from deals import select_best_deals
+    from quiet_hours import region_schedule
+    from storage import load_current_deals, load_lows
+    from subscriptions import region_subscriptions, match_subscriptions
+    from telegram_sender import get_region_chat_id
+
+    current = load_current_deals(region)
+    lows = load_lows(region)
+    subscriptions = region_subscriptions(region)
+    results = [await update_leaderboard(
+        get_region_chat_id(region), select_best_deals(current), region, lows, region_schedule(region),
+    )]
+    for chat_id, deals in match_subscriptions(current, subscriptions).items():
+        results.append(await update_leaderboard(chat_id, deals, region, lows, subscriptions[chat_id]["schedule"]))
+    return results
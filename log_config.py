@@ -0,0 +1,134 @@
+import os
+import re
+import copy
+import json
+import time
+import queue
+import atexit
+import logging
+import contextvars
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from logging.handlers import QueueHandler, QueueListener, RotatingFileHandler, TimedRotatingFileHandler
+
+# 📢 LOGGING CONFIGURATION
+# Environment settings are read in setup_logging(), after the .env file is loaded:
+# LOG_FORMAT (text | json), LOG_LEVEL, LOG_MAX_BYTES, LOG_BACKUP_COUNT and
+# LOG_ROTATE_WHEN (e.g. "midnight" for time-based rotation)
+LOG_FILE = "steam_promo_bot.log"
+DEFAULT_MAX_BYTES = 5 * 1024 * 1024
+DEFAULT_BACKUP_COUNT = 5
+
+TEXT_FORMAT = "%(asctime)s - %(levelname)s - %(message)s"
+STRUCTURED_FIELDS = ("execution_id", "stage", "appid", "duration_ms", "strategy", "error")
+
+# 📢 Run correlation state shared by every record
+_execution_id = None
+_stage = contextvars.ContextVar("stage", default=None)
+_listener = None
+
+# Leading emoji/pictograph prefix used by the human-readable messages
+_EMOJI_PREFIX = re.compile(r"^[^\w\s<\[(\"']+\s*")
+
+
+# 📢 Set the execution ID attached to every log record
+def set_execution_id(exec_id):
+    global _execution_id
+    _execution_id = exec_id
+
+
+# 📢 Log the duration of a pipeline stage and tag every record inside it
+@contextmanager
+def log_stage(stage):
+    token = _stage.set(stage)
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        duration_ms = round((time.perf_counter() - start) * 1000, 1)
+        logging.info(f"⏱️ Stage {stage} finished in {duration_ms} ms", extra={"duration_ms": duration_ms})
+        _stage.reset(token)
+
+
+# 📢 Injects the run correlation fields into each record
+class ContextFilter(logging.Filter):
+    def filter(self, record):
+        if getattr(record, "execution_id", None) is None:
+            record.execution_id = _execution_id
+        if getattr(record, "stage", None) is None:
+            record.stage = _stage.get()
+        if getattr(record, "error", None) is None and record.exc_info and record.exc_info[0]:
+            record.error = record.exc_info[0].__name__
+        return True
+
+
+# 📢 Formats each record as one JSON object per line
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        event = {
+            "ts": datetime.fromtimestamp(record.created, tz=timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": _EMOJI_PREFIX.sub("", record.getMessage()),
+        }
+        for field in STRUCTURED_FIELDS:
+            value = getattr(record, field, None)
+            if value is not None:
+                event[field] = value
+        if record.exc_info:
+            event["traceback"] = self.formatException(record.exc_info)
+        return json.dumps(event, ensure_ascii=False, default=str)
+
+
+# 📢 Queues records as-is so the formatters still see the exception info
+class LocalQueueHandler(QueueHandler):
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+
+# 📢 Build the rotating file handler
+def _file_handler(log_file):
+    backup_count = int(os.getenv("LOG_BACKUP_COUNT", str(DEFAULT_BACKUP_COUNT)))
+    rotate_when = os.getenv("LOG_ROTATE_WHEN", "").strip()
+    if rotate_when:
+        return TimedRotatingFileHandler(log_file, when=rotate_when, backupCount=backup_count, encoding="utf-8")
+    max_bytes = int(os.getenv("LOG_MAX_BYTES", str(DEFAULT_MAX_BYTES)))
+    return RotatingFileHandler(log_file, maxBytes=max_bytes, backupCount=backup_count, encoding="utf-8")
+
+
+# 📢 Stop the queue listener and flush pending records
+def shutdown_logging():
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        _listener = None
+
+
+# 📢 Configure logging: rotating file + console, written from a background thread
+def setup_logging(log_file=LOG_FILE):
+    global _listener
+    if _listener is not None:
+        return
+
+    log_format = os.getenv("LOG_FORMAT", "text").strip().lower()
+    formatter = JsonFormatter() if log_format == "json" else logging.Formatter(TEXT_FORMAT)
+    handlers = [_file_handler(log_file), logging.StreamHandler()]
+    for handler in handlers:
+        handler.setFormatter(formatter)
+
+    log_queue = queue.SimpleQueue()
+    queue_handler = LocalQueueHandler(log_queue)
+    queue_handler.addFilter(ContextFilter())
+
+    root = logging.getLogger()
+    root.setLevel(os.getenv("LOG_LEVEL", "INFO").strip().upper())
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+    root.addHandler(queue_handler)
+
+    _listener = QueueListener(log_queue, *handlers, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
@@ -0,0 +1,81 @@
+import asyncio
+import logging
+
+from config import MESSAGE_INTERVAL, PHOTO_GROUP_SIZE
+from deals import format_game_message
+from delivery import has_time, SEND_WORST_CASE
+from storage import load_media_cache, save_media_cache
+from telegram_sender import send_telegram_message, send_telegram_photo, send_telegram_media_group
+
+# Deal posts with the game's header image. The first upload of an image gives a Telegram file_id,
+# kept per appid in media_cache.json and reused for every later post, in any chat, so Telegram
+# never fetches the same image twice.
+
+HEADER_IMAGE_URL = "https://cdn.akamai.steamstatic.com/steam/apps/{appid}/header.jpg"
+
+
+# 📢 Photo of a deal: the cached file_id, else the header image URL (app details, or the CDN pattern)
+def deal_photo(deal, cache):
+    from enrichment import get_app_details
+
+    file_id = cache.get(str(deal.appid))
+    if file_id:
+        return file_id
+    details = get_app_details(deal.appid) or {}
+    return details.get("header_image") or HEADER_IMAGE_URL.format(appid=deal.appid)
+
+
+# 📢 Remember the file_id of a sent photo (the largest size)
+def remember_photo(cache, deal, message):
+    if message.photo:
+        cache[str(deal.appid)] = message.photo[-1].file_id
+
+
+# 📢 Send deals as photo posts, albums of up to PHOTO_GROUP_SIZE; returns (sent titles, titles not tried
+# before the run deadline). Deals without an appid (bundles), and deals whose photo fails, are sent as text.
+async def send_deal_posts(deals, titles, chat_id, region=""):
+    cache = load_media_cache()
+    with_photo = [title for title in titles if deals[title].appid]
+    as_text = [title for title in titles if not deals[title].appid]
+    delivered = []
+    tried = set()
+
+    for start in range(0, len(with_photo), PHOTO_GROUP_SIZE):
+        if not has_time(MESSAGE_INTERVAL + SEND_WORST_CASE):
+            break
+        group = with_photo[start:start + PHOTO_GROUP_SIZE]
+        tried.update(group)
+        items = [(deal_photo(deals[title], cache), format_game_message(deals[title], region)) for title in group]
+        if len(group) > 1:
+            messages = await send_telegram_media_group(items, chat_id=chat_id)
+            if messages:
+                for title, message in zip(group, messages):
+                    remember_photo(cache, deals[title], message)
+                delivered.extend(group)
+            else:
+                # A stale file_id fails the whole album: use the image URLs next time
+                for title in group:
+                    cache.pop(str(deals[title].appid), None)
+                as_text.extend(group)
+        else:
+            message = await send_telegram_photo(items[0][0], items[0][1], appid=deals[group[0]].appid, chat_id=chat_id)
+            if message:
+                remember_photo(cache, deals[group[0]], message)
+                delivered.append(group[0])
+            else:
+                cache.pop(str(deals[group[0]].appid), None)
+                as_text.append(group[0])
+        await asyncio.sleep(MESSAGE_INTERVAL)
+
+    save_media_cache(cache)
+    if as_text:
+        logging.info(f"📝 {len(as_text)} promotions sent as text instead of photos.")
+    for title in as_text:
+        if not has_time(MESSAGE_INTERVAL + SEND_WORST_CASE):
+            break
+        tried.add(title)
+        deal = deals[title]
+        if await send_telegram_message(format_game_message(deal, region), appid=deal.appid, chat_id=chat_id):
+            delivered.append(title)
+        await asyncio.sleep(MESSAGE_INTERVAL)
+    return delivered, [title for title in titles if title not in tried]
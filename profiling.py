@@ -0,0 +1,171 @@
+import os
+import sys
+import asyncio
+import logging
+import subprocess
+from datetime import datetime
+
+# 📢 PROFILING CONFIGURATION
+# BOT_PROFILE=cpu|mem|asyncio wraps a run in cProfile, tracemalloc or asyncio debug mode
+PROFILE_MODES = ("cpu", "mem", "asyncio")
+PROFILE_TOP_N = int(os.getenv("BOT_PROFILE_TOP", "30"))
+SLOW_CALLBACK_MS = int(os.getenv("BOT_PROFILE_SLOW_MS", "100"))
+
+# 📢 IMPORT-TIME BUDGET
+IMPORT_BUDGET_MS = 30
+HEAVY_MODULES = ("telegram", "bs4", "requests", "dotenv", "httpx")
+
+
+# 📢 Get requested profile mode (None when profiling is off)
+def get_profile_mode():
+    mode = os.getenv("BOT_PROFILE", "").strip().lower()
+    if not mode:
+        return None
+    if mode not in PROFILE_MODES:
+        logging.warning(f"⚠️ Unknown BOT_PROFILE '{mode}'. Expected one of: {', '.join(PROFILE_MODES)}.")
+        return None
+    return mode
+
+
+# 📢 Build the artifact path for this run, next to the log file
+def artifact_path(mode, extension, log_file):
+    directory = os.path.dirname(os.path.abspath(log_file))
+    stamp = datetime.now().strftime("%Y%m%d-%H%M%S")
+    return os.path.join(directory, f"profile_{mode}_{stamp}.{extension}")
+
+
+# 📢 Run a coroutine under cProfile and dump a pstats file
+def _run_cpu(main, log_file):
+    import cProfile
+    import pstats
+
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        return asyncio.run(main())
+    finally:
+        profiler.disable()
+        path = artifact_path("cpu", "pstats", log_file)
+        profiler.dump_stats(path)
+        with open(path[:-len(".pstats")] + ".txt", "w", encoding="utf-8") as f:
+            stats = pstats.Stats(profiler, stream=f)
+            stats.sort_stats("cumulative").print_stats(PROFILE_TOP_N)
+        logging.info(f"⏱️ CPU profile saved to {path}")
+
+
+# 📢 Run a coroutine under tracemalloc and save the top allocation sites
+def _run_mem(main, log_file):
+    import tracemalloc
+
+    tracemalloc.start(25)
+    try:
+        return asyncio.run(main())
+    finally:
+        snapshot = tracemalloc.take_snapshot()
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        snapshot = snapshot.filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap>"),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap_external>"),
+        ))
+        path = artifact_path("mem", "txt", log_file)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"Current: {current / 1024:.1f} KiB, peak: {peak / 1024:.1f} KiB\n\n")
+            f.write(f"Top {PROFILE_TOP_N} allocation sites:\n")
+            for stat in snapshot.statistics("lineno")[:PROFILE_TOP_N]:
+                f.write(f"{stat}\n")
+        logging.info(f"🧠 Memory profile saved to {path} (peak {peak / 1024:.1f} KiB)")
+
+
+# 📢 Collects the slow callback warnings emitted by asyncio in debug mode
+class _SlowCallbackCollector(logging.Handler):
+    def __init__(self):
+        super().__init__(level=logging.WARNING)
+        self.messages = []
+
+    def emit(self, record):
+        message = record.getMessage()
+        if message.startswith("Executing"):
+            self.messages.append(f"{datetime.fromtimestamp(record.created).isoformat()} {message}")
+
+
+# 📢 Run a coroutine in asyncio debug mode and save the list of slow callbacks
+def _run_asyncio(main, log_file):
+    collector = _SlowCallbackCollector()
+    asyncio_logger = logging.getLogger("asyncio")
+    asyncio_logger.addHandler(collector)
+
+    async def debug_main():
+        loop = asyncio.get_running_loop()
+        loop.slow_callback_duration = SLOW_CALLBACK_MS / 1000
+        return await main()
+
+    try:
+        return asyncio.run(debug_main(), debug=True)
+    finally:
+        asyncio_logger.removeHandler(collector)
+        path = artifact_path("asyncio", "txt", log_file)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(f"Slow callbacks (> {SLOW_CALLBACK_MS} ms): {len(collector.messages)}\n\n")
+            for message in collector.messages:
+                f.write(f"{message}\n")
+        logging.info(f"🐢 {len(collector.messages)} slow callbacks saved to {path}")
+
+
+# 📢 Run the main coroutine, profiled when BOT_PROFILE is set
+def run_with_profiling(main, log_file):
+    mode = get_profile_mode()
+    if mode == "cpu":
+        return _run_cpu(main, log_file)
+    if mode == "mem":
+        return _run_mem(main, log_file)
+    if mode == "asyncio":
+        return _run_asyncio(main, log_file)
+    return asyncio.run(main())
+
+
+# 📢 Measure the cumulative import time of modules ("bot,storage") with `python -X importtime`
+# A module also imported by an earlier one is counted once, inside it.
+def measure_import_time(modules):
+    names = modules.split(",")
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {', '.join(names)}"],
+        capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__))
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"import {modules} failed:\n{result.stderr}")
+
+    cumulative_us = 0
+    imported = set()
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if not cumulative.strip().isdigit():
+            continue
+        top_level = not name.startswith("  ")
+        name = name.strip()
+        imported.add(name.split(".")[0])
+        if top_level and name in names:
+            cumulative_us += int(cumulative)
+    return cumulative_us / 1000, imported
+
+
+# 📢 Check that importing modules stays under budget and loads no heavy dependency
+def check_import_budget(modules="bot", budget_ms=IMPORT_BUDGET_MS):
+    import_ms, imported = measure_import_time(modules)
+    heavy = sorted(imported.intersection(HEAVY_MODULES))
+    print(f"import {modules}: {import_ms:.1f} ms (budget {budget_ms} ms)")
+    if heavy:
+        print(f"❌ Heavy dependencies imported eagerly: {', '.join(heavy)}")
+    if import_ms > budget_ms:
+        print("❌ Import time over budget")
+    return not heavy and import_ms <= budget_ms
+
+
+if __name__ == "__main__":
+    # python profiling.py [module[,module...]] [budget_ms]
+    module_names = sys.argv[1] if len(sys.argv) > 1 else "bot"
+    budget = float(sys.argv[2]) if len(sys.argv) > 2 else IMPORT_BUDGET_MS
+    sys.exit(0 if check_import_budget(module_names, budget) else 1)
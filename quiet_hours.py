@@ -0,0 +1,89 @@
+import os
+import re
+import logging
+from datetime import datetime
+
+from config import QUIET_HOURS, QUIET_TIMEZONE
+from storage import load_deferred_chats, save_deferred_chats
+
+# Per-chat delivery windows. Outside its window a chat gets nothing: its deals wait in the queue, where a
+# newer price of the same game replaces the older one, and the first run after the window opens sends
+# them all in one digest. A schedule is ((start, end) minutes of the day, timezone name), validated when the
+# settings are loaded (make_schedule): an invalid one is logged and means no quiet hours.
+
+QUIET_HOURS_PATTERN = re.compile(r"^(\d{1,2})(?::(\d{2}))?-(\d{1,2})(?::(\d{2}))?$")
+
+
+# 📢 Parse quiet hours ("23-8", "23:00-07:30") into (start, end) minutes of the day
+# (None when empty, ValueError when malformed)
+def parse_quiet_hours(text):
+    if not text:
+        return None
+    match = QUIET_HOURS_PATTERN.match(str(text).replace(" ", ""))
+    if not match:
+        raise ValueError(f"invalid quiet hours {text!r} (expected e.g. 23-8 or 23:00-07:30)")
+    start_hours, start_minutes, end_hours, end_minutes = (int(value or 0) for value in match.groups())
+    if max(start_hours, end_hours) > 23 or max(start_minutes, end_minutes) > 59:
+        raise ValueError(f"invalid quiet hours {text!r} (hours 0-23, minutes 0-59)")
+    return start_hours * 60 + start_minutes, end_hours * 60 + end_minutes
+
+
+# 📢 Validated schedule of quiet hours and a timezone (QUIET_TIMEZONE when empty)
+# None when there are no quiet hours, or when they are invalid (logged with `source`)
+def make_schedule(quiet_hours, timezone=None, source="QUIET_HOURS"):
+    from zoneinfo import ZoneInfo
+
+    try:
+        window = parse_quiet_hours(quiet_hours)
+        if window is None:
+            return None
+        timezone = timezone or QUIET_TIMEZONE
+        ZoneInfo(timezone)
+    except (ValueError, KeyError, TypeError) as e:  # ZoneInfoNotFoundError is a KeyError
+        logging.warning(f"⚠️ Ignoring the quiet hours of {source}: {e}", extra={"error": type(e).__name__})
+        return None
+    return window, timezone
+
+
+# 📢 Schedule of a region chat: QUIET_HOURS_<CC> when set, else QUIET_HOURS
+def region_schedule(region=""):
+    variable = f"QUIET_HOURS_{region.upper()}"
+    if region and os.getenv(variable):
+        return make_schedule(os.getenv(variable), QUIET_TIMEZONE, variable)
+    return make_schedule(QUIET_HOURS, QUIET_TIMEZONE)
+
+
+# 📢 Whether a chat is in its quiet hours right now
+def is_quiet(schedule, now=None):
+    if not schedule:
+        return False
+    from zoneinfo import ZoneInfo
+
+    window, timezone = schedule
+    now = now or datetime.now(ZoneInfo(timezone))
+    minute = now.hour * 60 + now.minute
+    start, end = window
+    if start <= end:
+        return start <= minute < end
+    return minute >= start or minute < end  # Window across midnight
+
+
+# 📢 Remember that deliveries to a chat were held back
+def defer_chat(chat_id, count):
+    deferred = load_deferred_chats()
+    if str(chat_id) not in deferred:
+        deferred[str(chat_id)] = datetime.now().isoformat(timespec="seconds")
+        save_deferred_chats(deferred)
+    logging.info(f"🌙 Quiet hours in chat {chat_id}: {count} promotions held back.")
+
+
+# 📢 Whether a chat has deliveries held back (its window just opened)
+def is_deferred(chat_id):
+    return str(chat_id) in load_deferred_chats()
+
+
+# 📢 Forget the held-back deliveries of a chat (its digest was sent)
+def clear_deferred(chat_id):
+    deferred = load_deferred_chats()
+    if deferred.pop(str(chat_id), None) is not None:
+        save_deferred_chats(deferred)
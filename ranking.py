@@ -0,0 +1,113 @@
+import heapq
+
+from config import RANK_WEIGHTS
+from deals import format_deal_line
+
+# Deals are ranked by a weighted score so the best ones are sent first (and only the top K one by one):
+#   discount (points) + savings (% of the median original price of the deals ranked, so the weights
+#   hold in every currency) + review quality (% positive x count bucket)
+#   + a bonus when the price dropped below every price seen before (historic low)
+
+# 📢 Telegram message limit, with room for the "and N more" line
+DIGEST_MAX_LENGTH = 3900
+
+
+# 📢 Record the lowest price of each deal: {title: [lowest_cents, dropped]}
+# `dropped` is set once the price went below the first price seen, so a new game is not a "low".
+def update_lows(lows, deals):
+    changed = False
+    for title, deal in deals.items():
+        if deal.current_cents is None:
+            continue
+        entry = lows.get(title)
+        if entry is None:
+            lows[title] = [deal.current_cents, False]
+            changed = True
+        elif deal.current_cents < entry[0]:
+            lows[title] = [deal.current_cents, True]
+            changed = True
+    return changed
+
+
+# 📢 Whether a deal is at its historic low price
+def is_historic_low(title, deal, lows):
+    entry = lows.get(title)
+    return bool(entry and entry[1] and deal.current_cents is not None and deal.current_cents <= entry[0])
+
+
+# 📢 Median original price of the deals ranked, in cents (0 when none is priced)
+def median_price(deals):
+    prices = sorted(deal.original_cents for deal in deals.values() if deal.original_cents)
+    return prices[len(prices) // 2] if prices else 0
+
+
+# 📢 Score of a deal (higher is better); `median_cents` from median_price of the deals ranked
+def score_deal(title, deal, lows=None, weights=RANK_WEIGHTS, median_cents=0):
+    savings_cents = max((deal.original_cents or 0) - (deal.current_cents or 0), 0)
+    savings = savings_cents * 100 / median_cents if median_cents else 0
+    review = (deal.review_percent or 0) / 100 * deal.review_bucket
+    low = 1 if lows and is_historic_low(title, deal, lows) else 0
+    return (weights["discount"] * deal.discount + weights["savings"] * savings
+            + weights["review"] * review + weights["low"] * low)
+
+
+# 📢 Scores of every deal at once with NumPy columns (same values as score_deal)
+def score_columns(columns, lows=None, weights=RANK_WEIGHTS):
+    from columnar import np
+
+    prices = columns.original_cents[columns.original_cents > 0]
+    median_cents = np.partition(prices, len(prices) // 2)[len(prices) // 2] if len(prices) else 0
+    savings = np.maximum(columns.savings_cents, 0) * 100 / median_cents if median_cents else 0
+    review = columns.review_percent / 100 * columns.review_bucket
+    scores = weights["discount"] * columns.discount + weights["savings"] * savings + weights["review"] * review
+    if lows:
+        low = np.fromiter((is_historic_low(title, deal, lows) for title, deal in zip(columns.titles, columns.deals)),
+                          dtype=bool, count=len(columns))
+        scores = scores + weights["low"] * low
+    return scores
+
+
+# 📢 Split deals into the top `k` (list of titles, best first) and the rest (dict, original order)
+# A bounded heap keeps only k candidates: O(n log k). k = 0 or None ranks every deal.
+def top_deals(deals, k=None, lows=None):
+    from columnar import use_columns
+
+    k = k or len(deals)
+    if use_columns(len(deals)):
+        from columnar import DealColumns, top_indices
+
+        columns = DealColumns(deals)
+        top = [columns.titles[i] for i in top_indices(score_columns(columns, lows), k)]
+    else:
+        heap = []
+        median_cents = median_price(deals)
+        for index, (title, deal) in enumerate(deals.items()):
+            # Ties go to the deal seen first
+            item = (score_deal(title, deal, lows, median_cents=median_cents), -index, title)
+            if len(heap) < k:
+                heapq.heappush(heap, item)
+            elif item > heap[0]:
+                heapq.heapreplace(heap, item)
+        top = [title for _, _, title in sorted(heap, reverse=True)]
+
+    selected = set(top)
+    rest = {title: deal for title, deal in deals.items() if title not in selected}
+    return top, rest
+
+
+# 📢 One message summarizing several deals (best first), cut to fit in a Telegram message
+# Returns (text, number of deals shown): the deals after the cut are only counted in "… and N more".
+def format_digest(deals, region="", title=None):
+    region_text = f" ({region.upper()})" if region else ""
+    lines = [f"{title or f'📋 {len(deals)} more deals'}{region_text}:"]
+    length = len(lines[0])
+    shown = 0
+    for deal in deals:
+        line = format_deal_line(deal)
+        if length + len(line) + 1 > DIGEST_MAX_LENGTH:
+            lines.append(f"… and {len(deals) - shown} more")
+            break
+        lines.append(line)
+        length += len(line) + 1
+        shown += 1
+    return "\n".join(lines), shown
@@ -0,0 +1,356 @@
+import re
+import json
+import time
+import asyncio
+import hashlib
+import logging
+import statistics
+from html import unescape
+from bs4 import BeautifulSoup
+
+from config import (
+    STEAM_PROMO_URL, SCRAPE_PAGES, SCRAPE_PAGE_SIZE, STEAM_LANGUAGE, SCRAPE_CONCURRENCY, SCRAPE_INTERVAL,
+    SCRAPE_MIN_ROWS_RATIO, SCRAPE_MIN_COMPLETENESS, get_regions, region_path,
+)
+from deals import Deal, PLATFORM_BITS, review_bucket
+from ranking import update_lows
+from storage import (
+    load_history, save_history, load_fingerprints, save_fingerprints, load_lows, save_lows,
+    load_scrape_health, save_scrape_health,
+)
+
+# Markers around the result rows; anything outside them (tokens, ads) changes on every request
+RESULTS_START_MARKER = 'id="search_resultsRows"'
+RESULTS_END_MARKER = 'class="search_pagination'
+
+# Review tooltip: "Very Positive<br>82% of the 500,123 user reviews ..." (any language)
+REVIEW_PATTERN = re.compile(r"(\d{1,3})%\D+?(\d[\d,.\s]*)")
+
+# Result rows read straight from the markup, without building a DOM (the "attributes" strategy)
+ROW_PATTERN = re.compile(r'<a(\s[^>]*?class="search_result_row[^"]*"[^>]*)>(.*?)</a>', re.S)
+ATTRIBUTE_PATTERN = re.compile(r'([\w-]+)="([^"]*)"')
+TITLE_PATTERN = re.compile(r'<span class="title">(.*?)</span>', re.S)
+DISCOUNT_ATTRIBUTE_PATTERN = re.compile(r'data-discount="(\d+)"')
+ORIGINAL_PRICE_PATTERN = re.compile(r'class="discount_original_price">([^<]*)<')
+FINAL_PRICE_PATTERN = re.compile(r'class="discount_final_price[^"]*">([^<]*)<')
+PLATFORM_PATTERN = re.compile(r'class="platform_img ([\w ]+)"')
+REVIEW_TOOLTIP_PATTERN = re.compile(r'class="search_review_summary[^"]*"[^>]*?data-tooltip-html="([^"]*)"')
+
+# 📢 Recent page row counts kept per region for the sanity checks
+HEALTH_WINDOW = 20
+
+# 📢 Build the URL of a search results page
+def page_url(page, region=""):
+    url = STEAM_PROMO_URL
+    if region:
+        url += f"&cc={region}&l={STEAM_LANGUAGE}"
+    return url if page == 1 else f"{url}&page={page}"
+
+# 📢 Content hash of the result rows of a page, computed without parsing
+def page_fingerprint(html):
+    start = html.find(RESULTS_START_MARKER)
+    end = html.find(RESULTS_END_MARKER, max(start, 0))
+    rows = html[max(start, 0):end if end != -1 else len(html)]
+    return hashlib.blake2b(rows.encode("utf-8"), digest_size=16).hexdigest()
+
+# 📢 Download the Steam promotions page through the HTTP cache (None on error)
+def fetch_promotions_page(url=STEAM_PROMO_URL):
+    from http_cache import fetch_text
+
+    return fetch_text(url, headers={"User-Agent": "Mozilla/5.0"})
+
+# 📢 Politeness budget shared by every region: bounded concurrency and spacing between requests
+class Politeness:
+    def __init__(self, concurrency=SCRAPE_CONCURRENCY, interval=SCRAPE_INTERVAL):
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.interval = interval
+        self.lock = asyncio.Lock()
+        self.next_slot = 0.0
+
+    async def fetch(self, url):
+        async with self.semaphore:
+            async with self.lock:
+                delay = self.next_slot - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                self.next_slot = time.monotonic() + self.interval
+            return await asyncio.to_thread(fetch_promotions_page, url)
+
+# 📢 Appid from the row attributes (None for bundles and packages)
+def parse_row_appid(item):
+    appid = item.get("data-ds-appid", "")
+    return int(appid) if appid.isdigit() else None
+
+# 📢 Review score, tags and platforms from the row attributes, as compact integer fields
+def parse_row_quality(item):
+    fields = {}
+
+    tag_ids = item.get("data-ds-tagids")
+    if tag_ids:
+        try:
+            fields["tag_ids"] = [int(tag_id) for tag_id in json.loads(tag_ids)]
+        except (ValueError, TypeError):
+            pass
+
+    platforms = 0
+    for icon in item.select(".platform_img"):
+        for css_class in icon.get("class", []):
+            platforms |= PLATFORM_BITS.get(css_class, 0)
+    fields["platforms"] = platforms
+
+    review = item.select_one(".search_review_summary")
+    match = REVIEW_PATTERN.search(review.get("data-tooltip-html", "")) if review else None
+    if match:
+        fields["review_percent"] = int(match.group(1))
+        fields["review_bucket"] = review_bucket(int("".join(filter(str.isdigit, match.group(2)))))
+
+    return fields
+
+# 📢 Parse the promotions out of a search results page
+def parse_promotions(html):
+    soup = BeautifulSoup(html, 'html.parser')
+    games = {}
+
+    for item in soup.select('.search_result_row'):
+        try:
+            title = item.select_one('.title').text.strip()
+            discount_element = item.select_one('.discount_pct')
+            original_price_element = item.select_one('.discount_original_price')
+            current_price_element = item.select_one('.discount_final_price')
+
+            discount_text = discount_element.text.strip() if discount_element else "0%"
+            original_price = original_price_element.text.strip() if original_price_element else "N/A"
+            current_price = current_price_element.text.strip() if current_price_element else "N/A"
+
+            games[title] = Deal.from_text(
+                title, discount_text, original_price, current_price, item["href"],
+                appid=parse_row_appid(item), **parse_row_quality(item),
+            )
+        except Exception as e:
+            logging.warning(f"Error processing item: {e}", extra={"error": type(e).__name__})
+
+    return games
+
+# 📢 Parse the promotions out of a search results page from the row data attributes (regular expressions)
+def parse_promotions_attributes(html):
+    games = {}
+    for match in ROW_PATTERN.finditer(html):
+        attributes = {name: unescape(value) for name, value in ATTRIBUTE_PATTERN.findall(match.group(1))}
+        body = match.group(2)
+        title = TITLE_PATTERN.search(body)
+        if not title or "href" not in attributes:
+            continue
+        title = unescape(title.group(1)).strip()
+        discount = DISCOUNT_ATTRIBUTE_PATTERN.search(body)
+        original_price = ORIGINAL_PRICE_PATTERN.search(body)
+        current_price = FINAL_PRICE_PATTERN.search(body)
+
+        fields = {}
+        try:
+            fields["tag_ids"] = [int(tag_id) for tag_id in json.loads(attributes.get("data-ds-tagids") or "[]")]
+        except (ValueError, TypeError):
+            pass
+        fields["platforms"] = 0
+        for classes in PLATFORM_PATTERN.findall(body):
+            for css_class in classes.split():
+                fields["platforms"] |= PLATFORM_BITS.get(css_class, 0)
+        review = REVIEW_TOOLTIP_PATTERN.search(body)
+        review = REVIEW_PATTERN.search(unescape(review.group(1))) if review else None
+        if review:
+            fields["review_percent"] = int(review.group(1))
+            fields["review_bucket"] = review_bucket(int("".join(filter(str.isdigit, review.group(2)))))
+
+        appid = attributes.get("data-ds-appid", "")
+        games[title] = Deal.from_text(
+            title, f"-{discount.group(1)}%" if discount else "0%",
+            unescape(original_price.group(1)).strip() if original_price else "N/A",
+            unescape(current_price.group(1)).strip() if current_price else "N/A",
+            attributes["href"], appid=int(appid) if appid.isdigit() else None, **fields,
+        )
+    return games
+
+# 📢 Extraction strategies run on a fetched page, cheapest first; "json" (fetch_json_promotions) is the last resort
+PAGE_STRATEGIES = {"attributes": parse_promotions_attributes, "selectors": parse_promotions}
+
+# 📢 Parse a page of the search JSON endpoint (the same rows, in "results_html")
+async def fetch_json_promotions(politeness, page, region=""):
+    url = f"{page_url(1, region)}&infinite=1&start={(page - 1) * SCRAPE_PAGE_SIZE}&count={SCRAPE_PAGE_SIZE}"
+    text = await politeness.fetch(url)
+    try:
+        return parse_promotions(json.loads(text or "{}").get("results_html") or "")
+    except (ValueError, AttributeError) as e:
+        logging.warning(f"⚠️ Invalid search JSON: {e}", extra={"error": type(e).__name__})
+        return {}
+
+# 📢 Share of records with every field a message needs
+def completeness(games):
+    if not games:
+        return 0.0
+    complete = sum(
+        1 for deal in games.values()
+        if deal.name and deal.discount > 0 and deal.original_cents is not None and deal.current_cents is not None
+        and deal.link.startswith("http")
+    )
+    return complete / len(games)
+
+# 📢 Whether more results follow a page (its pagination links to the next page)
+def has_next_page(html, page):
+    start = html.find(RESULTS_END_MARKER)
+    return start != -1 and f"page={page + 1}" in html[start:]
+
+# 📢 Why the records of a page look broken, compared to recent runs (None when they look fine)
+# The row count is only checked on a page expected to be full (`full_page`): the last results page is short.
+def check_page(games, health, full_page=True):
+    if not games:
+        return "no rows"
+    recent = health.get("rows")
+    usual = statistics.median(recent) if recent and full_page else 0
+    if len(games) < SCRAPE_MIN_ROWS_RATIO * usual:
+        return f"{len(games)} rows, usually {usual:g}"
+    share = completeness(games)
+    if share < SCRAPE_MIN_COMPLETENESS:
+        return f"{share:.0%} complete records"
+    return None
+
+# 📢 Strategy order: the page strategies fastest first (by their recent timings), then the JSON endpoint
+def strategy_order(health):
+    timings = health.get("timings", {})
+    return sorted(PAGE_STRATEGIES, key=lambda name: timings.get(name, 0)) + ["json"]
+
+# 📢 Parse a page with the fastest strategy whose records pass the sanity checks: (games, strategy),
+# or (the largest rejected result, None) when none does. Each attempt is timed (duration_ms, strategy).
+async def extract_page(html, page, region, politeness, health, full_page=True):
+    label = region.upper() or "default"
+    timings = health.setdefault("timings", {})
+    rejected = {}
+    for name in strategy_order(health):
+        start = time.perf_counter()
+        if name == "json":
+            games = await fetch_json_promotions(politeness, page, region)
+        else:
+            games = PAGE_STRATEGIES[name](html)
+        duration_ms = round((time.perf_counter() - start) * 1000, 1)
+        timings[name] = round(0.7 * timings[name] + 0.3 * duration_ms, 1) if name in timings else duration_ms
+
+        problem = check_page(games, health, full_page)
+        extra = {"duration_ms": duration_ms, "strategy": name}
+        if problem is None:
+            logging.info(f"🧩 Page {page} ({label}) parsed by {name}: {len(games)} rows in {duration_ms} ms.", extra=extra)
+            return games, name
+        logging.warning(f"🧩 Page {page} ({label}) rejected from {name}: {problem} ({duration_ms} ms).", extra=extra)
+        rejected = max(rejected, games, key=len)
+    return rejected, None
+
+# 📢 Record the outcome of a region's crawl and alert the admin when the parser breaks or recovers
+# "ok": parsed from the page, "degraded": only the JSON endpoint worked, "broken": no strategy worked
+async def report_scrape_health(health, strategies, region=""):
+    label = region.upper() or "default"
+    state = "broken" if None in strategies else "degraded" if "json" in strategies else "ok"
+    previous = health.get("state", "ok")
+    health["state"] = state
+    health["strategies"] = strategies
+
+    if state == "broken":
+        logging.error(f"🚨 Scraper broken ({label}): no strategy produced valid promotions.", extra={"error": "ScraperBroken"})
+    elif state == "degraded":
+        logging.warning(f"⚠️ Scraper degraded ({label}): promotions parsed from the JSON endpoint.")
+    if state != previous:
+        from telegram_sender import send_admin_alert
+
+        await send_admin_alert({
+            "broken": f"Steam parser broken ({label}): no extraction strategy produced valid promotions. "
+                      f"Promotions are not being updated.",
+            "degraded": f"Steam parser degraded ({label}): the page markup changed, promotions come from the JSON endpoint.",
+            "ok": f"Steam parser recovered ({label}).",
+        }[state])
+
+# 📢 Extract the promotions of one region (only pages and records that changed since the last run)
+# The titles of each page are kept with its fingerprint: their union is what is on sale now (storage.load_current_deals).
+# `on_free(region, deals, fetched_at)` gets the new free-to-keep deals of each page as soon as it is parsed.
+async def extract_region_promotions(region, politeness, save_html=None, force=False, on_free=None):
+    label = region.upper() or "default"
+    fingerprints = load_fingerprints(region)
+    page_fingerprints = fingerprints["pages"]
+    record_fingerprints = fingerprints["records"]
+    urls = [page_url(page, region) for page in range(1, SCRAPE_PAGES + 1)]
+    page_titles = fingerprints["page_titles"] = {
+        url: titles for url, titles in fingerprints.get("page_titles", {}).items() if url in urls
+    }
+    fingerprints_changed = False
+    games = {}
+    free_tasks = []
+    health = load_scrape_health(region)
+    strategies = []
+
+    for page, url in enumerate(urls, 1):
+        html = await politeness.fetch(url)
+        if html is None:
+            break  # The pages not fetched keep their titles from the last crawl
+        fetched_at = time.monotonic()
+        if save_html and page == 1:
+            with open(save_html, "w", encoding="utf-8") as file:
+                file.write(html)
+        if page > 1 and "search_result_row" not in html:
+            # Past the last results page (a broken markup shows on page 1 already)
+            for ended_url in urls[page - 1:]:
+                fingerprints_changed |= page_titles.pop(ended_url, None) is not None
+            break
+
+        digest = page_fingerprint(html)
+        if not force and page_fingerprints.get(url) == digest and url in page_titles:
+            logging.info(f"⏭️ Page {page} ({label}) unchanged since the last run. Skipping.")
+            continue
+
+        full_page = page == 1 or has_next_page(html, page)
+        page_games, strategy = await extract_page(html, page, region, politeness, health, full_page)
+        strategies.append(strategy)
+        if full_page:
+            # Rejected pages count too, so a lasting change of the page size is accepted after a few runs
+            health["rows"] = (health.get("rows", []) + [len(page_games)])[-HEALTH_WINDOW:]
+        if strategy is None:
+            break  # Fingerprint not saved: the page is parsed again on the next run
+        page_fingerprints[url] = digest
+        page_titles[url] = list(page_games)
+        fingerprints_changed = True
+
+        free = {}
+        for title, deal in page_games.items():
+            record_digest = deal.fingerprint()
+            if force or record_fingerprints.get(title) != record_digest:
+                record_fingerprints[title] = record_digest
+                games[title] = deal
+                if deal.free_to_keep:
+                    free[title] = deal
+        if free and on_free:
+            free_tasks.append(asyncio.create_task(on_free(region, free, fetched_at)))
+
+    if games:
+        history = load_history(region)
+        history.update(games)
+        save_history(history, region)
+        lows = load_lows(region)
+        if update_lows(lows, games):
+            save_lows(lows, region)
+    if fingerprints_changed:
+        save_fingerprints(fingerprints, region)
+    if strategies:
+        await report_scrape_health(health, strategies, region)
+        save_scrape_health(health, region)
+    await asyncio.gather(*free_tasks)
+
+    logging.info(f"✅ Promotions saved successfully ({len(games)} new or changed promotions, {label}).")
+    return games
+
+# 📢 Extract promotions from Steam, crawling every region at the same time
+async def extract_promotions(save_html=None, force=False, regions=None, on_free=None):
+    regions = regions or get_regions()
+    politeness = Politeness()
+    results = await asyncio.gather(*(
+        extract_region_promotions(
+            region, politeness,
+            save_html=region_path(save_html, region) if save_html else None,
+            force=force, on_free=on_free,
+        )
+        for region in regions
+    ))
+    return dict(zip(regions, results))
@@ -0,0 +1,267 @@
+import os
+import json
+import logging
+
+from config import (
+    HISTORY_FILE, BEST_DEALS_FILE, EXECUTION_ID_FILE, OUTBOX_FILE, FINGERPRINTS_FILE, APP_METADATA_FILE, LOWS_FILE,
+    SUBSCRIPTION_OUTBOX_FILE, SUBSCRIPTION_SENT_FILE, WATCHES_FILE, UPDATE_OFFSET_FILE, LEADERBOARD_FILE, MEDIA_CACHE_FILE,
+    DEFERRED_CHATS_FILE, NOTIFIED_FILE, SCRAPE_HEALTH_FILE,
+    region_path,
+)
+
+# 📢 Get Execution ID
+def get_execution_id():
+    if os.path.exists(EXECUTION_ID_FILE):
+        try:
+            with open(EXECUTION_ID_FILE, "r") as f:
+                return int(f.read().strip())  
+        except ValueError:
+            return 1  
+    return 1  
+
+# 📢 Update Execution ID
+def save_execution_id(exec_id):
+    with open(EXECUTION_ID_FILE, "w") as f:
+        f.write(str(exec_id))
+
+# 📢 Get the offset of the next Telegram update to read (None before the first run)
+def get_update_offset():
+    try:
+        with open(UPDATE_OFFSET_FILE, "r") as f:
+            return int(f.read().strip())
+    except (FileNotFoundError, ValueError):
+        return None
+
+# 📢 Save the offset of the next Telegram update to read
+def save_update_offset(offset):
+    with open(UPDATE_OFFSET_FILE, "w") as f:
+        f.write(str(offset))
+
+# 📢 Load a JSON state file
+def load_json(path, label):
+    try:
+        with open(path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        logging.warning(f"⚠️ {label} file not found or corrupted. Creating a new one.")
+        return {}
+
+# 📢 Save a JSON state file
+def save_json(path, data):
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=4, ensure_ascii=False)
+
+# 📢 Load a JSON state file of deals keyed by title
+# Region files hold compact records (prices only); name and link come from the shared app metadata.
+def load_deals(path, label, metadata=None):
+    from deals import Deal
+
+    deals = {}
+    for title, data in load_json(path, label).items():
+        try:
+            if "link" not in data and metadata is not None:
+                data = dict(metadata[title], **data, name=title)
+            deal = Deal.from_dict(data)
+            deals[deal.name if deal.name == title else title] = deal
+        except (KeyError, TypeError, ValueError) as e:
+            logging.warning(f"⚠️ Skipping invalid record '{title}' in {path}: {e}", extra={"error": type(e).__name__})
+    return deals
+
+# 📢 Save a JSON state file of deals keyed by title (compact records leave out the per-app fields)
+def save_deals(path, deals, compact=False):
+    from deals import APP_FIELDS
+
+    records = {}
+    for title, deal in deals.items():
+        record = deal.to_dict()
+        if compact:
+            for field in ("name", "link") + APP_FIELDS:
+                record.pop(field, None)
+        records[title] = record
+    save_json(path, records)
+
+# 📢 Load the per-app metadata shared by every region
+def load_app_metadata():
+    if not os.path.exists(APP_METADATA_FILE):
+        return {}
+    return load_json(APP_METADATA_FILE, "App metadata")
+
+# 📢 Record the metadata of new apps (stored once, whatever the number of regions)
+def update_app_metadata(deals):
+    from deals import APP_FIELDS
+
+    metadata = load_app_metadata()
+    changed = False
+    for title, deal in deals.items():
+        record = deal.to_dict()
+        entry = {"appid": deal.appid, "link": deal.link}
+        entry.update((field, record[field]) for field in APP_FIELDS if field in record)
+        if metadata.get(title) != entry:
+            metadata[title] = entry
+            changed = True
+    if changed:
+        save_json(APP_METADATA_FILE, metadata)
+
+# 📢 Load the deals of a region state file
+def load_region_deals(path, label, region=""):
+    if not region:
+        return load_deals(path, label)
+    return load_deals(region_path(path, region), f"{label} ({region.upper()})", load_app_metadata())
+
+# 📢 Save the deals of a region state file
+def save_region_deals(path, deals, region=""):
+    if not region:
+        save_deals(path, deals)
+        return
+    update_app_metadata(deals)
+    save_deals(region_path(path, region), deals, compact=True)
+
+# 📢 Load history
+def load_history(region=""):
+    return load_region_deals(HISTORY_FILE, "History", region)
+
+# 📢 Save history
+def save_history(history, region=""):
+    save_region_deals(HISTORY_FILE, history, region)
+
+# 📢 Load previously sent best deals
+def load_best_deals(region=""):
+    return load_region_deals(BEST_DEALS_FILE, "Best deals", region)
+
+# 📢 Save sent best deals
+def save_best_deals(best_deals, region=""):
+    save_region_deals(BEST_DEALS_FILE, best_deals, region)
+
+# 📢 Load deals waiting to be sent
+def load_outbox(region=""):
+    return load_region_deals(OUTBOX_FILE, "Outbox", region)
+
+# 📢 Save deals waiting to be sent
+def save_outbox(outbox, region=""):
+    save_region_deals(OUTBOX_FILE, outbox, region)
+
+# 📢 Load page and record fingerprints from the last scrape
+def load_fingerprints(region=""):
+    fingerprints = load_json(region_path(FINGERPRINTS_FILE, region), "Fingerprints")
+    fingerprints.setdefault("pages", {})
+    fingerprints.setdefault("records", {})
+    return fingerprints
+
+# 📢 Titles on the specials pages at the last crawl (history records missing from them are sales that ended)
+def load_current_titles(region=""):
+    pages = load_fingerprints(region).get("page_titles", {})
+    return {title for titles in pages.values() for title in titles}
+
+# 📢 History records still on sale (on the specials pages at the last crawl)
+def load_current_deals(region=""):
+    current = load_current_titles(region)
+    return {title: deal for title, deal in load_history(region).items() if title in current}
+
+# 📢 Save page and record fingerprints
+def save_fingerprints(fingerprints, region=""):
+    save_json(region_path(FINGERPRINTS_FILE, region), fingerprints)
+
+# 📢 Load the lowest price seen per game ({title: [lowest_cents, dropped]})
+def load_lows(region=""):
+    path = region_path(LOWS_FILE, region)
+    if not os.path.exists(path):
+        return {}
+    return load_json(path, "Historic lows")
+
+# 📢 Save the lowest price seen per game
+def save_lows(lows, region=""):
+    save_json(region_path(LOWS_FILE, region), lows)
+
+# 📢 Load when each game was last sent to the region chat ({appid or title: epoch seconds})
+def load_notified(region=""):
+    path = region_path(NOTIFIED_FILE, region)
+    if not os.path.exists(path):
+        return {}
+    return load_json(path, "Notified games")
+
+# 📢 Save when each game was last sent to the region chat
+def save_notified(notified, region=""):
+    save_json(region_path(NOTIFIED_FILE, region), notified)
+
+# 📢 Load the parser health of a region ({"rows": [...], "timings": {strategy: ms}, "state": ...})
+def load_scrape_health(region=""):
+    path = region_path(SCRAPE_HEALTH_FILE, region)
+    if not os.path.exists(path):
+        return {}
+    return load_json(path, "Scrape health")
+
+# 📢 Save the parser health of a region
+def save_scrape_health(health, region=""):
+    save_json(region_path(SCRAPE_HEALTH_FILE, region), health)
+
+# 📢 Load the deals waiting for each subscribed chat ({chat_id: {title: deal}})
+def load_subscription_outbox():
+    from deals import Deal
+
+    if not os.path.exists(SUBSCRIPTION_OUTBOX_FILE):
+        return {}
+    outbox = {}
+    for chat_id, records in load_json(SUBSCRIPTION_OUTBOX_FILE, "Subscription outbox").items():
+        chat_outbox = outbox[chat_id] = {}
+        for title, data in records.items():
+            try:
+                chat_outbox[title] = Deal.from_dict(data)
+            except (KeyError, TypeError, ValueError) as e:
+                logging.warning(f"⚠️ Skipping invalid record '{title}' for chat {chat_id}: {e}", extra={"error": type(e).__name__})
+    return outbox
+
+# 📢 Save the deals waiting for each subscribed chat
+def save_subscription_outbox(outbox):
+    save_json(SUBSCRIPTION_OUTBOX_FILE, {
+        chat_id: {title: deal.to_dict() for title, deal in deals.items()} for chat_id, deals in outbox.items()
+    })
+
+# 📢 Load what was sent to each subscribed chat ({chat_id: {title: [discount, current_cents, sent_at]}})
+def load_subscription_sent():
+    if not os.path.exists(SUBSCRIPTION_SENT_FILE):
+        return {}
+    return load_json(SUBSCRIPTION_SENT_FILE, "Subscription state")
+
+# 📢 Save what was sent to each subscribed chat
+def save_subscription_sent(sent):
+    save_json(SUBSCRIPTION_SENT_FILE, sent)
+
+# 📢 Load the price watches ({appid: {chat_id: watch}})
+def load_watches():
+    if not os.path.exists(WATCHES_FILE):
+        return {}
+    return {int(appid): watchers for appid, watchers in load_json(WATCHES_FILE, "Watches").items()}
+
+# 📢 Save the price watches
+def save_watches(watches):
+    save_json(WATCHES_FILE, {str(appid): watchers for appid, watchers in sorted(watches.items())})
+
+# 📢 Load the leaderboard message of each chat ({chat_id: {"message_id", "digest"}})
+def load_leaderboards():
+    if not os.path.exists(LEADERBOARD_FILE):
+        return {}
+    return load_json(LEADERBOARD_FILE, "Leaderboards")
+
+# 📢 Save the leaderboard message of each chat
+def save_leaderboards(leaderboards):
+    save_json(LEADERBOARD_FILE, leaderboards)
+
+# 📢 Load the Telegram file_id of each header image ({appid: file_id})
+def load_media_cache():
+    if not os.path.exists(MEDIA_CACHE_FILE):
+        return {}
+    return load_json(MEDIA_CACHE_FILE, "Media cache")
+
+# 📢 Save the Telegram file_id of each header image
+def save_media_cache(cache):
+    save_json(MEDIA_CACHE_FILE, cache)
+
+# 📢 Load the chats whose deals are held back by quiet hours ({chat_id: since})
+def load_deferred_chats():
+    if not os.path.exists(DEFERRED_CHATS_FILE):
+        return {}
+    return load_json(DEFERRED_CHATS_FILE, "Deferred chats")
+
+# 📢 Save the chats whose deals are held back by quiet hours
+def save_deferred_chats(deferred):
+    save_json(DEFERRED_CHATS_FILE, deferred)
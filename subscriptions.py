@@ -0,0 +1,137 @@
+import os
+import time
+import logging
+
+from config import SUBSCRIPTIONS_FILE
+from deals import merge_deals, price_change, ready_deals
+from filters import normalize_rules, rules_key
+from quiet_hours import make_schedule
+from storage import (
+    load_json, load_subscription_outbox, save_subscription_outbox, load_subscription_sent, save_subscription_sent,
+)
+
+# One bot process serves many chats. subscriptions.json maps a chat id to its region and filter rules:
+#   {"-100123456789": {"region": "us", "rules": {"min_discount": 70, "max_price": 10},
+#                      "quiet_hours": "23-8", "timezone": "America/New_York"}}
+# Chats with identical rules share one predicate, so matching cost grows with the distinct rule sets.
+
+
+# 📢 Load the subscriptions ({chat_id: {"region": cc, "rules": normalized rules, "schedule": quiet hours}})
+def load_subscriptions():
+    if not os.path.exists(SUBSCRIPTIONS_FILE):
+        return {}
+    subscriptions = {}
+    for chat_id, data in load_json(SUBSCRIPTIONS_FILE, "Subscriptions").items():
+        try:
+            subscriptions[str(chat_id)] = {
+                "region": (data.get("region") or "").lower(),
+                "rules": normalize_rules(data.get("rules", {})),
+                "schedule": make_schedule(data.get("quiet_hours"), data.get("timezone"), f"subscription {chat_id}"),
+            }
+        except (AttributeError, TypeError, ValueError) as e:
+            logging.warning(f"⚠️ Skipping invalid subscription {chat_id}: {e}", extra={"error": type(e).__name__})
+    return subscriptions
+
+
+# 📢 Subscriptions of a region
+def region_subscriptions(region=""):
+    return {chat_id: data for chat_id, data in load_subscriptions().items() if data["region"] == region}
+
+
+# 📢 Group chats by identical rules: {rules_key: (rules, [chat_id, ...])}
+def group_subscriptions(subscriptions):
+    groups = {}
+    for chat_id, data in subscriptions.items():
+        groups.setdefault(rules_key(data["rules"]), (data["rules"], []))[1].append(chat_id)
+    return groups
+
+
+# 📢 Deals matched by each chat ({chat_id: {title: deal}}), every distinct rule set evaluated in one pass
+def match_subscriptions(deals, subscriptions):
+    from columnar import filter_deals_many
+
+    groups = list(group_subscriptions(subscriptions).values())
+    matches = filter_deals_many(deals, [rules for rules, _ in groups])
+    matched = {}
+    for (_, chat_ids), deals_matched in zip(groups, matches):
+        for chat_id in chat_ids:
+            matched[chat_id] = deals_matched
+    return matched
+
+
+# 📢 Queue, for each subscribed chat of a region, the matching deals it wasn't sent yet or that got
+# significantly better since (see deals.price_change); price increases are recorded without a message.
+# Games sent within CHANGE_COOLDOWN are queued too, and wait there until it ends (see send_subscription_deals).
+def queue_subscription_deals(deals, region=""):
+    subscriptions = region_subscriptions(region)
+    if not subscriptions or not deals:
+        return 0
+
+    outbox = load_subscription_outbox()
+    sent = load_subscription_sent()
+    queued = recorded = 0
+    for chat_id, matched in match_subscriptions(deals, subscriptions).items():
+        chat_sent = sent.get(chat_id, {})
+        new_deals = {}
+        for title, deal in matched.items():
+            previous = chat_sent.get(title)
+            if previous is None:
+                new_deals[title] = deal
+                continue
+            change = price_change(deal, previous[0], previous[1])
+            if change == "better":
+                new_deals[title] = deal
+            elif change == "worse":
+                chat_sent[title] = [deal.discount, deal.current_cents, *previous[2:]]
+                outbox.get(chat_id, {}).pop(title, None)  # Queued at a price that is gone
+                recorded += 1
+        if new_deals:
+            merge_deals(outbox.setdefault(chat_id, {}), new_deals)
+            queued += len(new_deals)
+        if chat_id in outbox and not outbox[chat_id]:
+            del outbox[chat_id]
+
+    save_subscription_outbox(outbox)
+    if recorded:
+        save_subscription_sent(sent)
+    groups = len(group_subscriptions(subscriptions))
+    logging.info(f"📥 {queued} promotions queued for {len(subscriptions)} subscribed chats ({groups} distinct filters).")
+    return queued
+
+
+# 📢 When a chat was last sent a game (None when never), from its subscription_sent.json entry
+def sent_at(chat_sent, title):
+    previous = chat_sent.get(title)
+    return previous[2] if previous and len(previous) > 2 else None
+
+
+# 📢 Send the queued deals of every subscribed chat of a region (games in their cooldown stay queued)
+async def send_subscription_deals(region="", lows=None, limit=None):
+    from delivery import deliver_deals
+
+    subscriptions = region_subscriptions(region)
+    outbox = load_subscription_outbox()
+    chat_ids = [chat_id for chat_id in subscriptions if outbox.get(chat_id)]
+    if not chat_ids:
+        return 0
+
+    sent = load_subscription_sent()
+    now = int(time.time())
+    delivered_count = 0
+    for chat_id in chat_ids:
+        chat_outbox = outbox[chat_id]
+        chat_sent = sent.setdefault(chat_id, {})
+        ready = ready_deals(chat_outbox, lambda title, deal: sent_at(chat_sent, title), now)
+        if not ready:
+            continue
+        delivered = await deliver_deals(ready, chat_id, region, lows, limit, subscriptions[chat_id]["schedule"])
+        for title in delivered:
+            deal = chat_outbox.pop(title)
+            chat_sent[title] = [deal.discount, deal.current_cents, now]
+        delivered_count += len(delivered)
+        if not chat_outbox:
+            del outbox[chat_id]
+
+    save_subscription_outbox(outbox)
+    save_subscription_sent(sent)
+    return delivered_count
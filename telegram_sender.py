@@ -0,0 +1,115 @@
+import os
+import asyncio
+import logging
+from telegram import Bot
+from telegram.constants import ParseMode
+from telegram.error import BadRequest
+from telegram.request import HTTPXRequest
+
+from config import BOT_VERSION, TELEGRAM_TIMEOUT, SEND_ATTEMPTS, SEND_RETRY_DELAY
+
+# 📢 BOT CONFIGURATION (created on first use)
+_bot = None
+
+# 📢 Get the Telegram bot, creating it on first use
+def get_bot():
+    global _bot
+    if _bot is None:
+        request = HTTPXRequest(
+            connect_timeout=TELEGRAM_TIMEOUT, read_timeout=TELEGRAM_TIMEOUT, write_timeout=TELEGRAM_TIMEOUT,
+        )
+        _bot = Bot(token=os.getenv("TELEGRAM_BOT_TOKEN"), request=request)
+    return _bot
+
+# 📢 Chat of a region: TELEGRAM_CHAT_ID_<CC> when set, else TELEGRAM_CHAT_ID
+def get_region_chat_id(region=""):
+    if region:
+        chat_id = os.getenv(f"TELEGRAM_CHAT_ID_{region.upper()}")
+        if chat_id:
+            return chat_id
+    return os.getenv("TELEGRAM_CHAT_ID")
+
+# 📢 Send messages to Telegram (returns the sent Message, or False)
+async def send_telegram_message(message, appid=None, chat_id=None, reply_markup=None):
+    chat_id = chat_id or os.getenv("TELEGRAM_CHAT_ID")
+    for attempt in range(1, SEND_ATTEMPTS + 1):
+        try:
+            sent_message = await get_bot().send_message(
+                chat_id=chat_id,
+                text=message,
+                parse_mode=ParseMode.HTML,
+                reply_markup=reply_markup,
+            )
+            logging.info(f"✅ Message successfully sent on attempt {attempt}!", extra={"appid": appid})
+            return sent_message
+        except Exception as e:
+            logging.error(f"❌ Error sending message (attempt {attempt}): {e}", extra={"appid": appid, "error": type(e).__name__})
+            if attempt < SEND_ATTEMPTS:
+                await asyncio.sleep(SEND_RETRY_DELAY)
+
+    logging.error(f"❌ Failed to send message after {SEND_ATTEMPTS} attempts.", extra={"appid": appid})
+    return False
+
+# 📢 Send a photo (URL or Telegram file_id) with an HTML caption (returns the sent Message, or False)
+async def send_telegram_photo(photo, caption, appid=None, chat_id=None):
+    try:
+        message = await get_bot().send_photo(chat_id=chat_id, photo=photo, caption=caption, parse_mode=ParseMode.HTML)
+        logging.info("✅ Photo successfully sent!", extra={"appid": appid})
+        return message
+    except Exception as e:
+        logging.error(f"❌ Error sending photo: {e}", extra={"appid": appid, "error": type(e).__name__})
+        return False
+
+# 📢 Send 2 to 10 photos as one album: [(photo, caption), ...] (returns the sent Messages, or False)
+async def send_telegram_media_group(items, chat_id=None):
+    from telegram import InputMediaPhoto
+
+    media = [InputMediaPhoto(photo, caption=caption, parse_mode=ParseMode.HTML) for photo, caption in items]
+    try:
+        messages = await get_bot().send_media_group(chat_id=chat_id, media=media)
+        logging.info(f"✅ Album of {len(items)} photos successfully sent!")
+        return messages
+    except Exception as e:
+        logging.error(f"❌ Error sending album: {e}", extra={"error": type(e).__name__})
+        return False
+
+# 📢 Replace the text of a message sent before (a text identical to the current one counts as done)
+async def edit_telegram_message(chat_id, message_id, message, reply_markup=None):
+    try:
+        await get_bot().edit_message_text(
+            chat_id=chat_id,
+            message_id=message_id,
+            text=message,
+            parse_mode=ParseMode.HTML,
+            reply_markup=reply_markup,
+        )
+        return True
+    except BadRequest as e:
+        if "not modified" in str(e).lower():
+            return True
+        logging.error(f"❌ Error editing message {message_id}: {e}", extra={"error": type(e).__name__})
+        return False
+    except Exception as e:
+        logging.error(f"❌ Error editing message {message_id}: {e}", extra={"error": type(e).__name__})
+        return False
+
+# 📢 Pin a message without notifying the members (needs the pin permission)
+async def pin_telegram_message(chat_id, message_id):
+    try:
+        await get_bot().pin_chat_message(chat_id=chat_id, message_id=message_id, disable_notification=True)
+        return True
+    except Exception as e:
+        logging.warning(f"⚠️ Could not pin message {message_id}: {e}", extra={"error": type(e).__name__})
+        return False
+
+# 📢 Notify Telegram about version update
+async def send_version_notification():
+    message = f"🚀 Steam Promo Bot - Version {BOT_VERSION} is now running!"
+    await send_telegram_message(message)
+
+# 📢 Alert the bot admin (TELEGRAM_ADMIN_CHAT_ID; without it the alert is only logged)
+async def send_admin_alert(message):
+    chat_id = os.getenv("TELEGRAM_ADMIN_CHAT_ID")
+    if not chat_id:
+        return False
+    return await send_telegram_message(f"🚨 {message}", chat_id=chat_id)
@@ -0,0 +1,98 @@
+import re
+import logging
+
+from deals import get_appid, format_game_message
+from storage import load_watches, save_watches
+
+# Per-user price watches, stored as an inverted index: {appid: {chat_id: {"max_cents", "notified_cents"}}}.
+# After a scrape only the changed records are looked up, so the cost follows the number of price
+# changes, not the number of watches.
+
+# Price cap typed by a user: whole units, or "." / "," with one or two decimals ("4.5", "4,99")
+MAX_PRICE_PATTERN = re.compile(r"^(\d+)(?:[.,](\d{1,2}))?$")
+
+
+# 📢 Appid from a command argument: "620" or a store link
+def parse_appid(text):
+    if text.isdigit():
+        return int(text)
+    return get_appid(text)
+
+
+# 📢 Cents of a price cap typed by a user (ValueError unless it matches MAX_PRICE_PATTERN)
+# Not deals.parse_price: store prices use "." or "," for thousands too, so "4.5" would mean 45.00 there.
+def parse_max_price(text):
+    match = MAX_PRICE_PATTERN.match(text.strip())
+    if not match:
+        raise ValueError(f"invalid price: {text} (e.g. 20, 4.5 or 4,99)")
+    units, decimals = match.groups()
+    return int(units) * 100 + int((decimals or "0").ljust(2, "0"))
+
+
+# 📢 Add (or update) a watch; `max_price` is the text given by the user, or None for any discount
+def add_watch(chat_id, appid, max_price=None):
+    max_cents = parse_max_price(max_price) if max_price else None
+    index = load_watches()
+    index.setdefault(appid, {})[str(chat_id)] = {"max_cents": max_cents, "notified_cents": None}
+    save_watches(index)
+    return max_cents
+
+
+# 📢 Remove a watch (False when there was none)
+def remove_watch(chat_id, appid):
+    index = load_watches()
+    watchers = index.get(appid, {})
+    if watchers.pop(str(chat_id), None) is None:
+        return False
+    if not watchers:
+        del index[appid]
+    save_watches(index)
+    return True
+
+
+# 📢 Watches of a chat ({appid: max_cents})
+def chat_watches(chat_id):
+    chat_id = str(chat_id)
+    return {appid: watchers[chat_id]["max_cents"] for appid, watchers in load_watches().items() if chat_id in watchers}
+
+
+# 📢 Whether a deal satisfies a watch (below the price cap, or discounted when there is no cap)
+def watch_matches(deal, entry):
+    if deal.current_cents is None:
+        return False
+    if entry["max_cents"] is None:
+        return deal.discount > 0
+    return deal.current_cents <= entry["max_cents"]
+
+
+# 📢 Send a direct message to the watchers of the changed deals that now match their watch
+# /watch and /unwatch can run during the sends (bot.py serve), so the index is reloaded before the
+# alerts are recorded, and only the watches that are still there unchanged are updated.
+async def notify_watchers(changed, region=""):
+    from telegram_sender import send_telegram_message
+
+    index = load_watches()
+    if not index or not changed:
+        return 0
+
+    alerts = []
+    for deal in changed.values():
+        watchers = index.get(deal.appid)
+        if not watchers:
+            continue
+        for chat_id, entry in watchers.items():
+            if not watch_matches(deal, entry) or entry["notified_cents"] == deal.current_cents:
+                continue
+            message = f"👀 Price alert for a game on your watch list!\n\n{format_game_message(deal, region)}"
+            if await send_telegram_message(message, appid=deal.appid, chat_id=chat_id):
+                alerts.append((deal.appid, chat_id, entry["max_cents"], deal.current_cents))
+
+    if alerts:
+        index = load_watches()
+        for appid, chat_id, max_cents, current_cents in alerts:
+            entry = index.get(appid, {}).get(chat_id)
+            if entry is not None and entry["max_cents"] == max_cents:
+                entry["notified_cents"] = current_cents
+        save_watches(index)
+    logging.info(f"👀 {len(alerts)} watch alerts sent for {len(changed)} changed promotions.")
+    return len(alerts)
@@ -0,0 +1,158 @@
+import json
+import time
+import asyncio
+import logging
+
+from config import (
+    WEBHOOK_URL, WEBHOOK_LISTEN, WEBHOOK_PORT, WEBHOOK_PATH, WEBHOOK_SECRET, WEBHOOK_CONCURRENCY,
+)
+
+# Webhook mode for `bot.py serve`: a small HTTP server (plain HTTP, TLS is left to the reverse proxy)
+# that receives Telegram updates and handles them in the same event loop as the crawler and sender.
+# Every update is acknowledged at once and handled in its own task, at most WEBHOOK_CONCURRENCY at a time.
+
+MAX_BODY_BYTES = 1024 * 1024
+SECRET_HEADER = "x-telegram-bot-api-secret-token"
+REASONS = {200: "OK", 400: "Bad Request", 403: "Forbidden", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large"}
+
+
+# 📢 Receives updates over HTTP and dispatches them to commands.handle_update
+class WebhookServer:
+    def __init__(self, path=WEBHOOK_PATH, secret=WEBHOOK_SECRET, concurrency=WEBHOOK_CONCURRENCY):
+        self.path = path
+        self.secret = secret
+        self.semaphore = asyncio.Semaphore(concurrency)
+        self.tasks = set()
+        self.received = 0
+
+    # 📢 Handle one update (errors are logged, never sent back to Telegram)
+    async def dispatch(self, data):
+        from telegram import Update
+        from commands import handle_update
+        from telegram_sender import get_bot
+
+        async with self.semaphore:
+            try:
+                await handle_update(Update.de_json(data, get_bot()))
+            except Exception as e:
+                logging.error(f"❌ Error handling a webhook update: {e}", extra={"error": type(e).__name__})
+
+    # 📢 Check a request and schedule its update; returns the HTTP status
+    def accept(self, method, path, headers, body):
+        if path.split("?")[0] != self.path:
+            return 404
+        if method != "POST":
+            return 405
+        if self.secret and headers.get(SECRET_HEADER) != self.secret:
+            return 403
+        try:
+            data = json.loads(body)
+        except ValueError:
+            return 400
+        if not isinstance(data, dict) or "update_id" not in data:
+            return 400
+        self.received += 1
+        task = asyncio.create_task(self.dispatch(data))
+        self.tasks.add(task)
+        task.add_done_callback(self.tasks.discard)
+        return 200
+
+    # 📢 Serve the requests of one connection (keep-alive until the client closes it)
+    async def handle_connection(self, reader, writer):
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line.strip():
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+                headers = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES:
+                    status = 413
+                else:
+                    status = self.accept(method, path, headers, await reader.readexactly(length))
+
+                body = b"ok" if status == 200 else REASONS[status].encode("ascii")
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS[status]}\r\nContent-Type: text/plain\r\n"
+                    f"Content-Length: {len(body)}\r\n\r\n".encode("ascii") + body
+                )
+                await writer.drain()
+                if status == 413 or headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    # 📢 Start listening
+    async def start(self, host=WEBHOOK_LISTEN, port=WEBHOOK_PORT):
+        server = await asyncio.start_server(self.handle_connection, host, port)
+        logging.info(f"🪝 Webhook server listening on http://{host}:{port}{self.path}")
+        return server
+
+    # 📢 Listen until cancelled
+    async def serve_forever(self):
+        server = await self.start()
+        async with server:
+            await server.serve_forever()
+
+
+# 📢 Register the webhook with Telegram and serve updates until cancelled
+# A public webhook always has a secret: without WEBHOOK_SECRET a random one is registered for this process,
+# so only Telegram can post updates through the reverse proxy.
+async def run_webhook():
+    import secrets
+    from commands import ALLOWED_UPDATES
+    from telegram_sender import get_bot
+
+    secret = WEBHOOK_SECRET
+    if not secret:
+        secret = secrets.token_urlsafe(32)
+        logging.info("🔑 WEBHOOK_SECRET is not set: a random secret was generated for this process.")
+    await get_bot().set_webhook(
+        url=WEBHOOK_URL, secret_token=secret, allowed_updates=ALLOWED_UPDATES, max_connections=WEBHOOK_CONCURRENCY,
+    )
+    logging.info(f"🪝 Webhook registered: {WEBHOOK_URL}")
+    await WebhookServer(secret=secret).serve_forever()
+
+
+# 📢 Test harness: post recorded updates (a JSON list) to a webhook server, `concurrency` at a time
+async def post_updates(path, url, secret=WEBHOOK_SECRET, concurrency=10, repeat=1):
+    import httpx
+
+    with open(path, "r", encoding="utf-8") as file:
+        payloads = json.load(file) * repeat
+    headers = {SECRET_HEADER: secret} if secret else {}
+    semaphore = asyncio.Semaphore(concurrency)
+    timings = []
+    statuses = {}
+
+    async with httpx.AsyncClient(timeout=10) as client:
+        async def post(payload):
+            async with semaphore:
+                start = time.perf_counter()
+                response = await client.post(url, json=payload, headers=headers)
+                timings.append(time.perf_counter() - start)
+                statuses[response.status_code] = statuses.get(response.status_code, 0) + 1
+
+        start = time.perf_counter()
+        await asyncio.gather(*(post(payload) for payload in payloads))
+        elapsed = time.perf_counter() - start
+
+    timings.sort()
+    return {
+        "posted": len(payloads),
+        "statuses": statuses,
+        "seconds": elapsed,
+        "p50_ms": timings[len(timings) // 2] * 1000 if timings else 0,
+        "max_ms": timings[-1] * 1000 if timings else 0,
+    }